@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the markdown generators
+
+Each benchmark compares the current implementation against the code it
+replaced, on synthetic input, and prints timings. Comparisons that need
+pandas are skipped when it is not installed.
+
+Usage:
+    python benchmark.py tsv [--rows N]
+    python benchmark.py frontmatter [--count N]
+    python benchmark.py escape [--count N]
+    python benchmark.py talkmap [--talks N] [--locations N] [--latency S]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(1, str(Path(__file__).parent.parent))
+
+import frontmatter
+import talkmap
+from tsvreader import read_tsv
+
+PUBLICATION_COLUMNS = ["pub_date", "title", "venue", "excerpt", "citation", "url_slug", "paper_url", "slides_url"]
+
+
+def timed(label: str, func: Callable, repeat: int = 3) -> float:
+    """Run ``func`` ``repeat`` times and print the best wall time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.2f} ms")
+    return best
+
+
+def have_pandas() -> bool:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# --- tsv ---------------------------------------------------------------------
+
+def synthetic_publications(path: Path, rows: int, seed: int = 0) -> None:
+    """Write a publications.tsv with ``rows`` rows; some optional cells are blank."""
+    rng = random.Random(seed)
+    words = ['asset', 'pricing', 'liquidity', 'risk', 'audit', 'credit', 'bank', 'market', 'volatility']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\t".join(PUBLICATION_COLUMNS) + "\n")
+        for i in range(rows):
+            title = " ".join(rng.choice(words) for _ in range(6)).capitalize() + f" {i}"
+            date = f"{rng.randint(1990, 2025)}-{rng.randint(1, 12):02d}-01"
+            excerpt = f"This paper studies {title.lower()} & more." if rng.random() < 0.7 else ""
+            citation = f'Name, Your. ({date[:4]}). "{title}." <i>Journal {i % 40}</i>. {i % 9}(1).'
+            url = f"http://example.org/files/paper{i}.pdf" if rng.random() < 0.5 else ""
+            f.write("\t".join([date, title, f"Journal {i % 40}", excerpt, citation,
+                               f"paper-{i}", url, ""]) + "\n")
+
+
+def _startup(statement: str) -> float:
+    """Best wall time of a fresh interpreter running ``statement``."""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True, cwd=Path(__file__).parent)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_tsv(args: argparse.Namespace) -> None:
+    pandas = have_pandas()
+    print("Interpreter startup plus import:")
+    baseline = _startup('pass')
+    print(f"  {'python -c pass':<40} {baseline * 1000:10.2f} ms")
+    print(f"  {'import tsvreader':<40} {_startup('import tsvreader') * 1000:10.2f} ms")
+    if pandas:
+        print(f"  {'import pandas':<40} {_startup('import pandas') * 1000:10.2f} ms")
+    else:
+        print("  import pandas                            (pandas not installed)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'publications.tsv'
+        synthetic_publications(path, args.rows)
+        print(f"Reading {args.rows} rows ({path.stat().st_size / 2**20:.1f} MB) and touching every field:")
+
+        def streaming():
+            for item in read_tsv(path, nonblank=["pub_date", "title", "url_slug"]):
+                (item.pub_date, item.title, item.venue, item.excerpt, item.citation,
+                 item.url_slug, item.paper_url)
+
+        def legacy():
+            import pandas as pd
+            for row, item in pd.read_csv(path, sep="\t", header=0).iterrows():
+                (item.pub_date, item.title, item.venue, item.excerpt, item.citation,
+                 item.url_slug, item.paper_url)
+
+        best = timed('read_tsv namedtuples', streaming)
+        print(f"  {'':<40} {args.rows / best:10.0f} rows/s")
+        if pandas:
+            best = timed('pandas read_csv + iterrows', legacy, repeat=1)
+            print(f"  {'':<40} {args.rows / best:10.0f} rows/s")
+
+
+# --- frontmatter -------------------------------------------------------------
+
+# Values that broke the old string concatenation: quotes of either kind,
+# colons, ampersands, comment markers, backslashes and line breaks
+TRICKY_VALUES = [
+    'Plain title',
+    'Say "hello": a study',
+    "Investors' attention & the market",
+    'Risk: evidence from A&B',
+    'Why #1 matters',
+    '- leading dash',
+    ': leading colon',
+    '"quoted" title',
+    "'single' title",
+    'Back\\slash \\n not a newline',
+    'Two\nlines',
+    'Tab\tseparated',
+    'Trailing colon:',
+    '',
+]
+
+
+def html_escape(text: str) -> str:
+    """The generators' html_escape before frontmatter.html_escape."""
+    return "".join(frontmatter.html_escape_table.get(c,c) for c in text)
+
+
+def _legacy_publication(item: Dict[str, str]) -> str:
+    """The publications.py markdown as it was built before frontmatter.py."""
+    md = "---\ntitle: \""   + item["title"] + '"\n'
+    md += """collection: publications"""
+    md += """\npermalink: /publication/""" + item["slug"]
+    if len(str(item["excerpt"])) > 5:
+        md += "\nexcerpt: '" + html_escape(item["excerpt"]) + "'"
+    md += "\ndate: " + str(item["date"])
+    md += "\nvenue: '" + html_escape(item["venue"]) + "'"
+    md += "\ncitation: '" + html_escape(item["citation"]) + "'"
+    md += "\n---"
+    md += "\nRecommended citation: " + item["citation"]
+    return md
+
+
+def _publication(item: Dict[str, str]) -> str:
+    """The publications.py markdown as it is built now."""
+    front = {
+        "title": item["title"],
+        "collection": "publications",
+        "permalink": "/publication/" + item["slug"],
+        "excerpt": frontmatter.html_escape(item["excerpt"]) if len(item["excerpt"]) > 5 else None,
+        "date": item["date"],
+        "venue": frontmatter.html_escape(item["venue"]),
+        "citation": frontmatter.html_escape(item["citation"]),
+    }
+    return frontmatter.publications.render(front, "\nRecommended citation: " + item["citation"])
+
+
+def _front_matter(document: str):
+    """Parsed front matter of a rendered document, or the error it raises."""
+    try:
+        return yaml.safe_load(document.split("\n---", 1)[0][4:])
+    except yaml.YAMLError as e:
+        return e
+
+
+def check_frontmatter() -> int:
+    """Round-trip TRICKY_VALUES through every quoting style; returns the failure count."""
+    failures = 0
+    for style in ("single", "double"):
+        schema = frontmatter.FrontMatter([("title", style), ("venue", style)])
+        for value in TRICKY_VALUES:
+            parsed = _front_matter(schema.render({"title": value, "venue": value}))
+            if not isinstance(parsed, dict) or parsed.get("title") != value or parsed.get("venue") != value:
+                failures += 1
+                print(f"  FAILED {style}: {value!r} -> {parsed!r}")
+    schema = frontmatter.FrontMatter([("permalink", "plain")])
+    for value in TRICKY_VALUES:
+        parsed = _front_matter(schema.render({"permalink": value}))
+        if not isinstance(parsed, dict) or str(parsed.get("permalink")) != value:
+            failures += 1
+            print(f"  FAILED plain: {value!r} -> {parsed!r}")
+
+    # publications.py HTML-escapes the venue but not the title
+    legacy_broken = 0
+    for value in TRICKY_VALUES:
+        item = {"title": value, "slug": "x", "excerpt": "", "date": "2020-01-01",
+                "venue": value, "citation": "c"}
+        for build, count in ((_publication, False), (_legacy_publication, True)):
+            parsed = _front_matter(build(item))
+            if (not isinstance(parsed, dict) or parsed.get("title") != value
+                    or parsed.get("venue") != html_escape(value)):
+                if count:
+                    legacy_broken += 1
+                else:
+                    failures += 1
+                    print(f"  FAILED publications.py: {value!r} -> {parsed!r}")
+    print(f"  round trip of {len(TRICKY_VALUES)} values x 3 styles and publications.py: {failures} failures "
+          f"(string concatenation lost or rejected {legacy_broken} of {len(TRICKY_VALUES)})")
+    return failures
+
+
+def synthetic_items(count: int, seed: int = 0) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        title = rng.choice(TRICKY_VALUES[:9]) + f" {i}"
+        items.append({"title": title, "slug": f"paper-{i}", "date": f"20{i % 25:02d}-01-01",
+                      "excerpt": f"Excerpt of paper {i} & more" if i % 3 else "",
+                      "venue": f"Journal {i % 40}", "citation": f"Name, Y. ({i}). {title}."})
+    return items
+
+
+def bench_frontmatter(args: argparse.Namespace) -> int:
+    print("Correctness:")
+    failures = check_frontmatter()
+
+    items = synthetic_items(args.count)
+    print(f"Building {args.count} publications.py documents, HTML escaping included:")
+    best = timed('string concatenation (legacy)', lambda: [_legacy_publication(item) for item in items])
+    print(f"  {'':<40} {args.count / best:10.0f} docs/s")
+    best = timed('dict + FrontMatter.render', lambda: [_publication(item) for item in items])
+    print(f"  {'':<40} {args.count / best:10.0f} docs/s")
+
+    records = [({"title": item["title"], "collection": "publications", "permalink": "/publication/" + item["slug"],
+                 "date": item["date"], "venue": item["venue"], "citation": item["citation"]},
+                "\nRecommended citation: " + item["citation"]) for item in items]
+    print(f"Rendering {args.count} prepared records:")
+    best = timed('FrontMatter.render_batch', lambda: frontmatter.publications.render_batch(records))
+    print(f"  {'':<40} {args.count / best:10.0f} docs/s")
+    best = timed('FrontMatter.render_batch (utf-8)',
+                 lambda: frontmatter.publications.render_batch(records, encoding="utf-8"))
+    print(f"  {'':<40} {args.count / best:10.0f} docs/s")
+    return 1 if failures else 0
+
+
+# --- escape ------------------------------------------------------------------
+
+def synthetic_citations(count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Publication fields shaped like a real citation list.
+
+    Citations always quote the title, so every one needs escaping; about a
+    fifth of titles and venues carry an ampersand or apostrophe.
+    """
+    rng = random.Random(seed)
+    words = ['asset', 'pricing', 'liquidity', 'risk', 'audit', 'credit', 'bank', 'market',
+             'volatility', 'disclosure', 'governance', 'earnings', 'evidence', 'from', 'the']
+    venues = ['Journal of Finance', 'Review of Financial Studies', 'Journal of Financial Economics',
+              'Journal of Accounting & Economics', "Proceedings of the Accountants' Forum",
+              'Management Science', 'The Accounting Review']
+    records = []
+    for i in range(count):
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(4, 12))).capitalize()
+        if rng.random() < 0.1:
+            title += ": Investors' attention"
+        elif rng.random() < 0.1:
+            title += " & market quality"
+        venue = rng.choice(venues)
+        authors = ", ".join(f"{rng.choice('ABCDEFGH')}. Author{rng.randint(1, 999)}"
+                            for _ in range(rng.randint(1, 4)))
+        records.append({
+            "title": title,
+            "venue": venue,
+            "citation": f'{authors} ({rng.randint(1990, 2025)}). "{title}." <i>{venue}</i>. '
+                        f'{rng.randint(1, 80)}({rng.randint(1, 6)}).',
+            "excerpt": f"We study {title.lower()} using data from {rng.randint(1, 90)} countries."
+                       if rng.random() < 0.7 else "",
+        })
+    return records
+
+
+def bench_escape(args: argparse.Namespace) -> int:
+    records = synthetic_citations(args.count)
+    fields = [value for record in records for value in record.values()]
+    needing = sum(1 for value in fields if frontmatter.html_escape(value) is not value)
+    mismatches = sum(1 for value in fields if frontmatter.html_escape(value) != html_escape(value))
+    print(f"{len(fields)} fields from {args.count} citations, {needing} of them with something to escape; "
+          f"{mismatches} differ from the legacy output")
+
+    best = timed('per-character join (legacy)', lambda: [html_escape(value) for value in fields])
+    print(f"  {'':<40} {len(fields) / best:10.0f} fields/s")
+    table = str.maketrans(frontmatter.html_escape_table)
+    best = timed('str.translate', lambda: [value.translate(table) for value in fields])
+    print(f"  {'':<40} {len(fields) / best:10.0f} fields/s")
+    best = timed('html_escape (fast path + str.replace)',
+                 lambda: [frontmatter.html_escape(value) for value in fields])
+    print(f"  {'':<40} {len(fields) / best:10.0f} fields/s")
+    return 1 if mismatches else 0
+
+
+# --- talkmap -----------------------------------------------------------------
+
+def synthetic_talks(folder: Path, talks: int, locations: int, seed: int = 0) -> None:
+    """Write ``talks`` talk files like talks.py's; one in ten has no location."""
+    rng = random.Random(seed)
+    places = [f"City {i}, Country {i % 50}" for i in range(locations)]
+    description = " ".join(rng.choice(['talk', 'about', 'markets', 'risk', 'data']) for _ in range(400))
+    for i in range(talks):
+        front = {"title": f"Talk {i}", "collection": "talks", "type": "Talk",
+                 "permalink": f"/talks/2020-01-01-talk-{i}", "venue": f"Venue {i % 97}",
+                 "date": "2020-01-01"}
+        if i % 10:
+            front["location"] = rng.choice(places)
+        (folder / f"2020-01-01-talk-{i}.md").write_text(
+            frontmatter.talks.render(front, "\n\n" + description + "\n"), encoding="utf-8")
+
+
+def _legacy_talkmap(paths, geocode):
+    """talkmap.py's read-and-geocode loop before the front matter parser and cache."""
+    location_dict = {}
+    location = ""
+    for file in paths:
+        with open(file, 'r') as f:
+            lines = f.read()
+            if lines.find('location: "') > 1:
+                loc_start = lines.find('location: "') + 11
+                lines_trim = lines[loc_start:]
+                loc_end = lines_trim.find('"')
+                location = lines_trim[:loc_end]
+            location_dict[location] = geocode(location)
+    return location_dict
+
+
+def _yaml_talk_location(path):
+    """talkmap.py's location read before the line scan: the whole front matter through YAML."""
+    lines = []
+    with open(path, encoding="utf-8-sig") as f:
+        if f.readline().rstrip() != "---":
+            return None
+        for line in f:
+            if line.rstrip() in ("---", "..."):
+                break
+            lines.append(line)
+    data = yaml.load("".join(lines), Loader=talkmap.YamlLoader)
+    location = data.get("location") if isinstance(data, dict) else None
+    return (str(location).strip() or None) if location is not None else None
+
+
+def bench_talkmap(args: argparse.Namespace) -> None:
+    calls = []
+
+    def resolve(location: str):
+        # Stand-in geocoder: a fixed network latency per request
+        calls.append(location)
+        time.sleep(args.latency)
+        return talkmap.Point(float(len(location)), 0.0)
+
+    unlimited = talkmap.TokenBucket(rate=1e9)
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        synthetic_talks(folder, args.talks, args.locations)
+        paths = sorted(str(path) for path in folder.glob("*.md"))
+        cache_file = str(folder / "geocache.json")
+        print(f"{args.talks} talks, {args.locations} distinct locations, "
+              f"{args.latency * 1000:.1f} ms per geocoding request:")
+
+        def run_legacy():
+            calls.clear()
+            return _legacy_talkmap(paths, resolve)
+
+        def run_new(cache: "talkmap.GeoCache"):
+            calls.clear()
+            return talkmap.geocode_locations(talkmap.read_locations(paths), cache, resolve, unlimited)[0]
+
+        timed('legacy: read whole files, geocode each', run_legacy, repeat=1)
+        print(f"  {'':<40} {len(calls):10d} requests")
+        timed('read_locations + geocode (cold cache)',
+              lambda: run_new(talkmap.GeoCache(cache_file)), repeat=1)
+        print(f"  {'':<40} {len(calls):10d} requests")
+        cache = talkmap.GeoCache(cache_file)
+        for location in dict.fromkeys(calls):
+            cache.put(location, resolve(location))
+        cache.save()
+        timed('read_locations + geocode (warm cache)', lambda: run_new(talkmap.GeoCache(cache_file)))
+        print(f"  {'':<40} {len(calls):10d} requests")
+
+        print("Per stage:")
+        timed('read: legacy str.find scan', lambda: _legacy_talkmap(paths, lambda location: None))
+        timed('read: front matter + YAML', lambda: [_yaml_talk_location(path) for path in paths])
+        timed('read: location line scan, 1 process', lambda: talkmap.read_locations(paths, workers=1))
+        if talkmap.READ_WORKERS > 1:
+            timed(f'read: location line scan, {talkmap.READ_WORKERS} processes',
+                  lambda: talkmap.read_locations(paths))
+        locations = talkmap.read_locations(paths)
+        timed('geocode (warm cache)',
+              lambda: talkmap.geocode_locations(locations, talkmap.GeoCache(cache_file), resolve, unlimited))
+        location_dict = talkmap.geocode_locations(locations, talkmap.GeoCache(cache_file), resolve, unlimited)[0]
+        timed('write org-locations.js (changed)',
+              lambda: (os.remove(folder / "org-locations.js") if (folder / "org-locations.js").exists() else None,
+                       talkmap.write_map_data(location_dict, str(folder))))
+        timed('write org-locations.js (unchanged)', lambda: talkmap.write_map_data(location_dict, str(folder)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Markdown generator micro-benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    tsv = sub.add_parser('tsv', help='TSV ingestion: pandas iterrows vs streaming read_tsv')
+    tsv.add_argument('--rows', type=int, default=100000)
+    tsv.set_defaults(func=bench_tsv)
+
+    front = sub.add_parser('frontmatter', help='front matter: string concatenation vs compiled FrontMatter, '
+                                               'plus a YAML round-trip check')
+    front.add_argument('--count', type=int, default=100000)
+    front.set_defaults(func=bench_frontmatter)
+
+    escape = sub.add_parser('escape', help='html_escape: per-character join vs table-driven replace')
+    escape.add_argument('--count', type=int, default=100000)
+    escape.set_defaults(func=bench_escape)
+
+    talks = sub.add_parser('talkmap', help='talkmap: string scan + per-file geocoding vs '
+                                           'front matter parsing + cached geocoding')
+    talks.add_argument('--talks', type=int, default=10000)
+    talks.add_argument('--locations', type=int, default=300)
+    talks.add_argument('--latency', type=float, default=0.001, help='seconds per geocoding request')
+    talks.set_defaults(func=bench_talkmap)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+# # Front matter rendering for the markdown generators
+#
+# Each collection's front matter is described once as a list of
+# `(key, style)` pairs. `FrontMatter` compiles that schema into a tuple of
+# `(key prefix, quoting function)` steps, and `render()` emits a whole
+# document, front matter and page body, with a single join.
+#
+# Styles:
+# - `plain`: unquoted, for dates, permalinks and collection names. A value
+#   that YAML could not read as a plain scalar (leading indicator, `: `,
+#   ` #`) falls back to double quotes. Otherwise YAML resolves its type as
+#   usual, which is how `date` becomes a date.
+# - `single`: `'...'`, with `'` doubled as YAML requires.
+# - `double`: `"..."`, with `\` and `"` backslash-escaped.
+# Unprintable characters, newlines included, always use double quotes with
+# escapes, since a single-quoted or plain scalar would fold them.
+#
+# The generators still HTML-escape the fields they always did (so quotes in
+# a citation come out as `&quot;`), with `html_escape` from this module;
+# the YAML quoting only makes sure whatever value it is given survives YAML
+# parsing unchanged.
+
+import re
+
+_DOUBLE_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t",
+                   "\x85": "\\N", "\u2028": "\\L", "\u2029": "\\P"}
+_NEEDS_DOUBLE_ESCAPE = re.compile(r'[\\"\x00-\x1f\x7f\x85\u2028\u2029]')
+_PLAIN_INDICATORS = frozenset(" -?:,[]{}#&*!|>'\"%@`")
+
+
+def _double_escape(match):
+    char = match.group()
+    return _DOUBLE_ESCAPES.get(char) or "\\x%02x" % ord(char)
+
+
+# Each quoting function first tries a few str methods that settle the common
+# case (no quotes, nothing unprintable) before falling back to a regex.
+
+def yaml_double(text):
+    """Double-quoted YAML scalar for text."""
+    if '"' not in text and "\\" not in text and text.isprintable():
+        return '"' + text + '"'
+    return '"' + _NEEDS_DOUBLE_ESCAPE.sub(_double_escape, text) + '"'
+
+
+def yaml_single(text):
+    """Single-quoted YAML scalar for text."""
+    if not text.isprintable():
+        return yaml_double(text)
+    if "'" in text:
+        text = text.replace("'", "''")
+    return "'" + text + "'"
+
+
+def yaml_plain(text):
+    """Unquoted YAML scalar for text, or a double-quoted one if plain is unsafe."""
+    if (text and text[0] not in _PLAIN_INDICATORS and text[-1] not in ": "
+            and ": " not in text and " #" not in text and text.isprintable()):
+        return text
+    return yaml_double(text)
+
+
+html_escape_table = {
+    "&": "&amp;",
+    '"': "&quot;",
+    "'": "&apos;"
+    }
+# "&" comes first so the entities added for the quotes are not escaped again
+_HTML_ESCAPES = tuple(html_escape_table.items())
+
+
+def html_escape(text):
+    """Produce entities within text."""
+    # Most titles and venues have nothing to escape; skip the copies for them.
+    # str.replace per character beats str.translate, whose multi-character
+    # replacements take CPython's slow path.
+    if "&" not in text and '"' not in text and "'" not in text:
+        return text
+    for char, entity in _HTML_ESCAPES:
+        text = text.replace(char, entity)
+    return text
+
+
+STYLES = {"plain": yaml_plain, "single": yaml_single, "double": yaml_double}
+
+
+class FrontMatter:
+    """A collection's front-matter schema, compiled once into a renderer."""
+
+    def __init__(self, fields):
+        """fields: (key, style) pairs in output order; style is a key of STYLES."""
+        try:
+            self.steps = tuple((key, key + ": ", STYLES[style]) for key, style in fields)
+        except KeyError as e:
+            raise ValueError(f"unknown front matter style {e}; expected one of {', '.join(STYLES)}") from None
+
+    def render(self, values, body=""):
+        """Markdown document for one record.
+
+        values maps keys to strings; keys that are missing or None are left
+        out. body is appended right after the closing `---`, so it
+        normally starts with a newline.
+        """
+        parts = ["---"]
+        append = parts.append
+        get = values.get
+        for key, prefix, quote in self.steps:
+            value = get(key)
+            if value is not None:
+                append(prefix + quote(str(value)))
+        append("---" + body)
+        return "\n".join(parts)
+
+    def render_batch(self, records, encoding=None):
+        """Render many (values, body) pairs.
+
+        Returns one string per record, or encoded bytes ready to write when
+        encoding is given.
+        """
+        render = self.render
+        if encoding is None:
+            return [render(values, body) for values, body in records]
+        return [render(values, body).encode(encoding) for values, body in records]
+
+
+publications = FrontMatter([
+    ("title", "double"),
+    ("collection", "plain"),
+    ("permalink", "plain"),
+    ("excerpt", "single"),
+    ("date", "plain"),
+    ("venue", "single"),
+    ("paperurl", "single"),
+    ("citation", "single"),
+])
+
+talks = FrontMatter([
+    ("title", "double"),
+    ("collection", "plain"),
+    ("type", "double"),
+    ("permalink", "plain"),
+    ("venue", "double"),
+    ("date", "plain"),
+    ("location", "double"),
+])
@@ -17,52 +17,40 @@
 # - `url_slug` will be the descriptive part of the .md file and the permalink URL for the page about the paper. The .md file will be `YYYY-MM-DD-[url_slug].md` and the permalink will be `https://[yourdomain]/publications/YYYY-MM-DD-[url_slug]`
 
 
-# ## Import pandas
-# 
-# We are using the very handy pandas library for dataframes.
-
-# In[2]:
-
-import pandas as pd
-
-
 # ## Import TSV
 # 
-# Pandas makes this easy with the read_csv function. We are using a TSV, so we specify the separator as a tab, or `\t`.
+# `read_tsv` (in tsvreader.py) streams the TSV one row at a time, so there is no need to import pandas. It checks the header before reading any rows and stops with an error naming the missing column or the line with a blank required value.
 # 
-# I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up. However, you can modify the import statement, as pandas also has read_excel(), read_json(), and others.
+# I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up.
 
 # In[3]:
 
-publications = pd.read_csv("publications.tsv", sep="\t", header=0)
-publications
+from tsvreader import read_tsv
+
+publications = read_tsv("publications.tsv",
+                        required=["excerpt", "paper_url"],
+                        nonblank=["pub_date", "title", "venue", "citation", "url_slug"])
 
 
 # ## Escape special characters
 # 
-# YAML is very picky about how it takes a valid string, so we are replacing single and double quotes (and ampersands) with their HTML encoded equivilents. This makes them look not so readable in raw format, but they are parsed and rendered nicely.
+# YAML is very picky about how it takes a valid string, so we are replacing single and double quotes (and ampersands) with their HTML encoded equivilents, using the shared `html_escape` in frontmatter.py. This makes them look not so readable in raw format, but they are parsed and rendered nicely.
 
 # In[4]:
 
-html_escape_table = {
-    "&": "&amp;",
-    '"': "&quot;",
-    "'": "&apos;"
-    }
-
-def html_escape(text):
-    """Produce entities within text."""
-    return "".join(html_escape_table.get(c,c) for c in text)
+from frontmatter import html_escape
 
 
 # ## Creating the markdown files
 # 
-# This is where the heavy lifting is done. This loops through all the rows in the TSV dataframe, then starts to concatentate a big string (```md```) that contains the markdown for each type. It does the YAML metadata first, then does the description for the individual page. If you don't want something to appear (like the "Recommended citation")
+# This is where the heavy lifting is done. This loops through all the rows in the TSV and builds the markdown (```md```) for each one. The YAML metadata goes in a dict that `frontmatter.publications` quotes and renders in front of the description for the individual page. If you don't want something to appear (like the "Recommended citation")
 
 # In[5]:
 
 import os
-for row, item in publications.iterrows():
+import frontmatter
+
+for item in publications:
     
     md_filename = str(item.pub_date) + "-" + item.url_slug + ".md"
     html_filename = str(item.pub_date) + "-" + item.url_slug
@@ -70,35 +58,33 @@ for row, item in publications.iterrows():
     
     ## YAML variables
     
-    md = "---\ntitle: \""   + item.title + '"\n'
-    
-    md += """collection: publications"""
+    has_excerpt = len(str(item.excerpt)) > 5
+    has_paper = len(str(item.paper_url)) > 5
     
-    md += """\npermalink: /publication/""" + html_filename
-    
-    if len(str(item.excerpt)) > 5:
-        md += "\nexcerpt: '" + html_escape(item.excerpt) + "'"
-    
-    md += "\ndate: " + str(item.pub_date) 
-    
-    md += "\nvenue: '" + html_escape(item.venue) + "'"
-    
-    if len(str(item.paper_url)) > 5:
-        md += "\npaperurl: '" + item.paper_url + "'"
-    
-    md += "\ncitation: '" + html_escape(item.citation) + "'"
-    
-    md += "\n---"
+    front = {
+        "title": item.title,
+        "collection": "publications",
+        "permalink": "/publication/" + html_filename,
+        "excerpt": html_escape(item.excerpt) if has_excerpt else None,
+        "date": str(item.pub_date),
+        "venue": html_escape(item.venue),
+        "paperurl": item.paper_url if has_paper else None,
+        "citation": html_escape(item.citation),
+    }
     
     ## Markdown description for individual page
     
-    if len(str(item.paper_url)) > 5:
-        md += "\n\n<a href='" + item.paper_url + "'>Download paper here</a>\n" 
+    body = ""
+    
+    if has_paper:
+        body += "\n\n<a href='" + item.paper_url + "'>Download paper here</a>\n" 
         
-    if len(str(item.excerpt)) > 5:
-        md += "\n" + html_escape(item.excerpt) + "\n"
+    if has_excerpt:
+        body += "\n" + html_escape(item.excerpt) + "\n"
         
-    md += "\nRecommended citation: " + item.citation
+    body += "\nRecommended citation: " + item.citation
+    
+    md = frontmatter.publications.render(front, body)
     
     md_filename = os.path.basename(md_filename)
        
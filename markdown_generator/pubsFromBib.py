@@ -14,15 +14,29 @@
 # 
 # TODO: Make this work with other databases of citations, 
 # TODO: Merge this with the existing TSV parsing solution
+#
+# Runs are incremental: each entry's fields are fingerprinted and a manifest
+# (`.pubsFromBib-manifest.json`) records which markdown file each entry
+# produced. Only new or changed entries are rendered, the files of entries
+# that left the bib files are deleted, and a file is only rewritten when its
+# bytes change. Parsing and rendering run in a process pool.
+# Pass `--full` to re-render everything and `--workers N` to size the pool.
+# When two entries render to the same file name the last one wins; a warning
+# names them.
 
 
-from pybtex.database.input import bibtex
-import pybtex.database.input.bibtex 
+from concurrent.futures import ProcessPoolExecutor
 from time import strptime
-import string
+import argparse
+import hashlib
 import html
+import json
 import os
 import re
+import tempfile
+
+import frontmatter
+from frontmatter import html_escape
 
 #todo: incorporate different collection types rather than a catch all publications, requires other changes to template
 publist = {
@@ -32,7 +46,7 @@ publist = {
         "venue-pretext": "In the proceedings of ",
         "collection" : {"name":"publications",
                         "permalink":"/publication/"}
-        
+
     },
     "journal":{
         "file": "pubs.bib",
@@ -40,121 +54,245 @@ publist = {
         "venue-pretext" : "",
         "collection" : {"name":"publications",
                         "permalink":"/publication/"}
-    } 
-}
-
-html_escape_table = {
-    "&": "&amp;",
-    '"': "&quot;",
-    "'": "&apos;"
     }
+}
 
-def html_escape(text):
-    """Produce entities within text."""
-    return "".join(html_escape_table.get(c,c) for c in text)
+output_dir = "../_publications/"
+manifest_file = ".pubsFromBib-manifest.json"
 
+def load_entries(pubsource):
+    """Parse one bib file into picklable (key, bib_id, fields, authors) tuples."""
+    from pybtex.database.input import bibtex
 
-for pubsource in publist:
     parser = bibtex.Parser()
     bibdata = parser.parse_file(publist[pubsource]["file"])
-
-    #loop through the individual references in a given bibtex file
+    entries = []
     for bib_id in bibdata.entries:
-        #reset default date
-        pub_year = "1900"
-        pub_month = "01"
-        pub_day = "01"
-        
-        b = bibdata.entries[bib_id].fields
-        
-        try:
-            pub_year = f'{b["year"]}'
-
-            #todo: this hack for month and day needs some cleanup
-            if "month" in b.keys(): 
-                if(len(b["month"])<3):
-                    pub_month = "0"+b["month"]
-                    pub_month = pub_month[-2:]
-                elif(b["month"] not in range(12)):
-                    tmnth = strptime(b["month"][:3],'%b').tm_mon   
-                    pub_month = "{:02d}".format(tmnth) 
-                else:
-                    pub_month = str(b["month"])
-            if "day" in b.keys(): 
-                pub_day = str(b["day"])
-
-                
-            pub_date = pub_year+"-"+pub_month+"-"+pub_day
-            
-            #strip out {} as needed (some bibtex entries that maintain formatting)
-            clean_title = b["title"].replace("{", "").replace("}","").replace("\\","").replace(" ","-")    
-
-            url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
-            url_slug = url_slug.replace("--","-")
-
-            md_filename = (str(pub_date) + "-" + url_slug + ".md").replace("--","-")
-            html_filename = (str(pub_date) + "-" + url_slug).replace("--","-")
-
-            #Build Citation from text
-            citation = ""
-
-            #citation authors - todo - add highlighting for primary author?
-            for author in bibdata.entries[bib_id].persons["author"]:
-                citation = citation+" "+author.first_names[0]+" "+author.last_names[0]+", "
-
-            #citation title
-            citation = citation + "\"" + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + ".\""
-
-            #add venue logic depending on citation type
-            venue = publist[pubsource]["venue-pretext"]+b[publist[pubsource]["venuekey"]].replace("{", "").replace("}","").replace("\\","")
-
-            citation = citation + " " + html_escape(venue)
-            citation = citation + ", " + pub_year + "."
-
-            
-            ## YAML variables
-            md = "---\ntitle: \""   + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + '"\n'
-            
-            md += """collection: """ +  publist[pubsource]["collection"]["name"]
-
-            md += """\npermalink: """ + publist[pubsource]["collection"]["permalink"]  + html_filename
-            
-            note = False
-            if "note" in b.keys():
-                if len(str(b["note"])) > 5:
-                    md += "\nexcerpt: '" + html_escape(b["note"]) + "'"
-                    note = True
-
-            md += "\ndate: " + str(pub_date) 
-
-            md += "\nvenue: '" + html_escape(venue) + "'"
-            
-            url = False
-            if "url" in b.keys():
-                if len(str(b["url"])) > 5:
-                    md += "\npaperurl: '" + b["url"] + "'"
-                    url = True
-
-            md += "\ncitation: '" + html_escape(citation) + "'"
-
-            md += "\n---"
-
-            
-            ## Markdown description for individual page
-            if note:
-                md += "\n" + html_escape(b["note"]) + "\n"
-
-            if url:
-                md += "\n[Access paper here](" + b["url"] + "){:target=\"_blank\"}\n" 
-            else:
-                md += "\nUse [Google Scholar](https://scholar.google.com/scholar?q="+html.escape(clean_title.replace("-","+"))+"){:target=\"_blank\"} for full citation"
-
-            md_filename = os.path.basename(md_filename)
-
-            with open("../_publications/" + md_filename, 'w', encoding="utf-8") as f:
-                f.write(md)
+        entry = bibdata.entries[bib_id]
+        #pybtex field names are case-insensitive, so key the plain dict by lower case
+        fields = {name.lower(): str(value) for name, value in entry.fields.items()}
+        authors = None
+        if "author" in entry.persons:
+            authors = [(list(p.first_names), list(p.last_names)) for p in entry.persons["author"]]
+        entries.append((pubsource + "/" + bib_id, bib_id, fields, authors))
+    return pubsource, entries
+
+
+def fingerprint(pubsource, fields, authors, code_hash):
+    """Hash of everything that determines an entry's markdown."""
+    payload = json.dumps([publist[pubsource], sorted(fields.items()), authors, code_hash])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render(pubsource, b, authors):
+    """Return (md_filename, md) for one entry; raises KeyError for a missing field."""
+    #reset default date
+    pub_year = "1900"
+    pub_month = "01"
+    pub_day = "01"
+
+    pub_year = f'{b["year"]}'
+
+    #todo: this hack for month and day needs some cleanup
+    if "month" in b.keys():
+        if(len(b["month"])<3):
+            pub_month = "0"+b["month"]
+            pub_month = pub_month[-2:]
+        elif(b["month"] not in range(12)):
+            tmnth = strptime(b["month"][:3],'%b').tm_mon
+            pub_month = "{:02d}".format(tmnth)
+        else:
+            pub_month = str(b["month"])
+    if "day" in b.keys():
+        pub_day = str(b["day"])
+
+
+    pub_date = pub_year+"-"+pub_month+"-"+pub_day
+
+    #strip out {} as needed (some bibtex entries that maintain formatting)
+    clean_title = b["title"].replace("{", "").replace("}","").replace("\\","").replace(" ","-")
+
+    url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
+    url_slug = url_slug.replace("--","-")
+
+    md_filename = (str(pub_date) + "-" + url_slug + ".md").replace("--","-")
+    html_filename = (str(pub_date) + "-" + url_slug).replace("--","-")
+
+    #Build Citation from text
+    citation = ""
+
+    #citation authors - todo - add highlighting for primary author?
+    if authors is None:
+        raise KeyError("author")
+    for first_names, last_names in authors:
+        citation = citation+" "+first_names[0]+" "+last_names[0]+", "
+
+    #citation title
+    citation = citation + "\"" + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + ".\""
+
+    #add venue logic depending on citation type
+    venue = publist[pubsource]["venue-pretext"]+b[publist[pubsource]["venuekey"]].replace("{", "").replace("}","").replace("\\","")
+
+    citation = citation + " " + html_escape(venue)
+    citation = citation + ", " + pub_year + "."
+
+
+    ## YAML variables
+    note = "note" in b.keys() and len(str(b["note"])) > 5
+    url = "url" in b.keys() and len(str(b["url"])) > 5
+
+    front = {
+        "title": html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")),
+        "collection": publist[pubsource]["collection"]["name"],
+        "permalink": publist[pubsource]["collection"]["permalink"] + html_filename,
+        "excerpt": html_escape(b["note"]) if note else None,
+        "date": str(pub_date),
+        "venue": html_escape(venue),
+        "paperurl": b["url"] if url else None,
+        "citation": html_escape(citation),
+    }
+
+
+    ## Markdown description for individual page
+    body = ""
+    if note:
+        body += "\n" + html_escape(b["note"]) + "\n"
+
+    if url:
+        body += "\n[Access paper here](" + b["url"] + "){:target=\"_blank\"}\n"
+    else:
+        body += "\nUse [Google Scholar](https://scholar.google.com/scholar?q="+html.escape(clean_title.replace("-","+"))+"){:target=\"_blank\"} for full citation"
+
+    md = frontmatter.publications.render(front, body)
+
+    return os.path.basename(md_filename), md
+
+
+def render_job(job):
+    """Pool wrapper around render(): returns (md_filename, md, missing_field)."""
+    pubsource, fields, authors = job
+    try:
+        md_filename, md = render(pubsource, fields, authors)
+    except KeyError as e:
+        return None, None, e
+    return md_filename, md, None
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already holds exactly these bytes."""
+    data = text.encode("utf-8")
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def load_manifest():
+    try:
+        with open(manifest_file, encoding="utf-8") as f:
+            return json.load(f).get("entries", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(entries):
+    fd, tmp = tempfile.mkstemp(dir=".", suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding="utf-8") as f:
+        json.dump({"entries": entries}, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, manifest_file)
+
+
+def main(argv=None):
+    argparser = argparse.ArgumentParser(description="Generate _publications markdown from BibTeX files")
+    argparser.add_argument("--full", action="store_true", help="re-render every entry, even unchanged ones")
+    argparser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = argparser.parse_args(argv)
+
+    code_hash = hashlib.sha256()
+    for source in (__file__, frontmatter.__file__):
+        with open(source, 'rb') as f:
+            code_hash.update(f.read())
+    code_hash = code_hash.hexdigest()
+    #--full still needs the old manifest to remove files of vanished entries
+    previous = load_manifest()
+    manifest = {}
+    jobs = []
+    entry_jobs = {}
+    unchanged = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        #bib files are parsed in parallel but their entries keep publist order
+        for pubsource, entries in pool.map(load_entries, publist):
+            for key, bib_id, fields, authors in entries:
+                digest = fingerprint(pubsource, fields, authors, code_hash)
+                entry_jobs[key] = (pubsource, fields, authors)
+                old = previous.get(key)
+                #entries that failed last time are retried so their warning shows again
+                if (not args.full and old is not None and old["fingerprint"] == digest and old["file"]
+                        and os.path.exists(output_dir + old["file"])):
+                    manifest[key] = old
+                    unchanged += 1
+                    continue
+                manifest[key] = {"fingerprint": digest, "file": None}
+                jobs.append((key, bib_id, fields, (pubsource, fields, authors)))
+
+        workers = args.workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * workers))
+        results = pool.map(render_job, [job for *_, job in jobs], chunksize=chunksize)
+
+        rendered = {}
+        for (key, bib_id, b, _), (md_filename, md, missing) in zip(jobs, results):
+            if missing is not None:
+                # field may not exist for a reference
+                print(f'WARNING Missing Expected Field {missing} from entry {bib_id}: \"', b["title"][:30],"..."*(len(b['title'])>30),"\"")
+                continue
+            manifest[key]["file"] = md_filename
+            rendered[key] = md
             print(f'SUCESSFULLY PARSED {bib_id}: \"', b["title"][:60],"..."*(len(b['title'])>60),"\"")
-        # field may not exist for a reference
-        except KeyError as e:
-            print(f'WARNING Missing Expected Field {e} from entry {bib_id}: \"', b["title"][:30],"..."*(len(b['title'])>30),"\"")
+
+    #the last entry with a given file name wins, as before, even when it was
+    #skipped as unchanged and an earlier one was re-rendered
+    owners = {}
+    for key, entry in manifest.items():
+        if entry["file"]:
+            owners.setdefault(entry["file"], []).append(key)
+    for md_filename, keys in owners.items():
+        if len(keys) > 1:
+            print(f'WARNING {len(keys)} entries render to {md_filename}, keeping the last: {", ".join(keys)}')
+            if keys[-1] not in rendered:
+                rendered[keys[-1]] = render_job(entry_jobs[keys[-1]])[1]
+                unchanged -= 1
+
+    written = identical = 0
+    for key, md in rendered.items():
+        md_filename = manifest[key]["file"]
+        if owners[md_filename][-1] != key:
             continue
+        if write_if_changed(output_dir + md_filename, md):
+            written += 1
+        else:
+            identical += 1
+
+    #remove files of entries that vanished or now render under another name
+    current_files = {entry["file"] for entry in manifest.values() if entry["file"]}
+    removed = 0
+    for key, entry in previous.items():
+        old_file = entry["file"]
+        if old_file and old_file not in current_files and os.path.exists(output_dir + old_file):
+            os.remove(output_dir + old_file)
+            removed += 1
+            print(f'REMOVED {old_file} (entry {key} changed or was deleted)')
+
+    save_manifest(manifest)
+    print(f'{len(manifest)} entries: {unchanged} unchanged, {written} written, '
+          f'{identical} re-rendered with identical output, {removed} stale files removed')
+
+
+if __name__ == '__main__':
+    main()
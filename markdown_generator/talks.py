@@ -9,9 +9,11 @@
 
 # In[1]:
 
-import pandas as pd
 import os
 
+import frontmatter
+from tsvreader import read_tsv
+
 
 # ## Data format
 # 
@@ -27,78 +29,60 @@ import os
 
 # ## Import TSV
 # 
-# Pandas makes this easy with the read_csv function. We are using a TSV, so we specify the separator as a tab, or `\t`.
+# `read_tsv` (in tsvreader.py) streams the TSV one row at a time, so there is no need to import pandas. It checks the header before reading any rows and stops with an error naming the missing column or the line with a blank required value.
 # 
-# I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up. However, you can modify the import statement, as pandas also has read_excel(), read_json(), and others.
+# I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up.
 
 # In[3]:
 
-talks = pd.read_csv("talks.tsv", sep="\t", header=0)
-talks
+talks = read_tsv("talks.tsv",
+                 required=["type", "venue", "location", "talk_url", "description"],
+                 nonblank=["title", "url_slug", "date"])
 
 
 # ## Escape special characters
 # 
-# YAML is very picky about how it takes a valid string, so we are replacing single and double quotes (and ampersands) with their HTML encoded equivilents. This makes them look not so readable in raw format, but they are parsed and rendered nicely.
+# YAML is very picky about how it takes a valid string, so we are replacing single and double quotes (and ampersands) with their HTML encoded equivilents, using the shared `html_escape` in frontmatter.py. This makes them look not so readable in raw format, but they are parsed and rendered nicely.
 
 # In[4]:
 
-html_escape_table = {
-    "&": "&amp;",
-    '"': "&quot;",
-    "'": "&apos;"
-    }
-
-def html_escape(text):
-    if type(text) is str:
-        return "".join(html_escape_table.get(c,c) for c in text)
-    else:
-        return "False"
+from frontmatter import html_escape
 
 
 # ## Creating the markdown files
 # 
-# This is where the heavy lifting is done. This loops through all the rows in the TSV dataframe, then starts to concatentate a big string (```md```) that contains the markdown for each type. It does the YAML metadata first, then does the description for the individual page.
+# This is where the heavy lifting is done. This loops through all the rows in the TSV and builds the markdown (```md```) for each one. The YAML metadata goes in a dict that `frontmatter.talks` quotes and renders in front of the description for the individual page.
 
 # In[5]:
 
 loc_dict = {}
 
-for row, item in talks.iterrows():
+for item in talks:
     
     md_filename = str(item.date) + "-" + item.url_slug + ".md"
     html_filename = str(item.date) + "-" + item.url_slug 
     year = item.date[:4]
     
-    md = "---\ntitle: \""   + item.title + '"\n'
-    md += "collection: talks" + "\n"
-    
-    if len(str(item.type)) > 3:
-        md += 'type: "' + item.type + '"\n'
-    else:
-        md += 'type: "Talk"\n'
-    
-    md += "permalink: /talks/" + html_filename + "\n"
-    
-    if len(str(item.venue)) > 3:
-        md += 'venue: "' + item.venue + '"\n'
-        
-    if len(str(item.location)) > 3:
-        md += "date: " + str(item.date) + "\n"
-    
-    if len(str(item.location)) > 3:
-        md += 'location: "' + str(item.location) + '"\n'
-           
-    md += "---\n"
+    front = {
+        "title": item.title,
+        "collection": "talks",
+        "type": item.type if len(str(item.type)) > 3 else "Talk",
+        "permalink": "/talks/" + html_filename,
+        "venue": item.venue if len(str(item.venue)) > 3 else None,
+        "date": str(item.date),
+        "location": str(item.location) if len(str(item.location)) > 3 else None,
+    }
     
+    body = "\n"
     
     if len(str(item.talk_url)) > 3:
-        md += "\n[More information here](" + item.talk_url + ")\n" 
+        body += "\n[More information here](" + item.talk_url + ")\n" 
         
     
     if len(str(item.description)) > 3:
-        md += "\n" + html_escape(item.description) + "\n"
+        body += "\n" + html_escape(item.description) + "\n"
         
+    md = frontmatter.talks.render(front, body)
         
     md_filename = os.path.basename(md_filename)
     #print(md)
@@ -0,0 +1,65 @@
+# coding: utf-8
+
+# # Streaming TSV reader for the markdown generators
+#
+# publications.py and talks.py used to load their TSV with pandas and loop
+# with `DataFrame.iterrows()`. Importing pandas took most of the run time for
+# a small TSV, and iterrows builds a Series for every row. `read_tsv` reads
+# the file in one pass with the csv module and yields one namedtuple per row,
+# so fields are still read as `item.title`.
+#
+# The header is checked before any row is read: every required column must
+# be present. Blank cells are empty strings (pandas gave NaN, whose `str()`
+# is "nan"; the generators' `len(...) > N` tests treat both as blank).
+# Quoting follows pandas' default: a cell that starts with `"` is a quoted
+# field.
+
+import csv
+from collections import namedtuple
+
+
+class TSVError(ValueError):
+    """The TSV is missing a column, has a malformed row or a blank required cell."""
+
+
+def read_tsv(path, required=(), nonblank=()):
+    """Yield one namedtuple per data row of the TSV at path.
+
+    required: columns the header must contain.
+    nonblank: columns that must have a value in every row.
+    """
+    with open(path, newline='', encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            raise TSVError(f"{path}: empty file, expected a header row")
+        header = [name.strip() for name in header]
+
+        missing = [name for name in list(required) + list(nonblank) if name not in header]
+        if missing:
+            raise TSVError(f"{path}: missing column(s) {', '.join(dict.fromkeys(missing))}; "
+                           f"header has {', '.join(header)}")
+        duplicated = sorted({name for name in header if header.count(name) > 1})
+        if duplicated:
+            raise TSVError(f"{path}: duplicated column(s) {', '.join(duplicated)}")
+        try:
+            Row = namedtuple("Row", header)
+        except ValueError as e:
+            raise TSVError(f"{path}: unusable column name ({e})") from None
+
+        width = len(header)
+        padding = ("",) * width
+        checks = [(header.index(name), name) for name in nonblank]
+        make = Row._make
+        for row in reader:
+            if len(row) != width:
+                if not row:
+                    continue
+                if len(row) > width:
+                    raise TSVError(f"{path}, line {reader.line_num}: {len(row)} fields, header has {width}")
+                # pandas fills short rows with blanks
+                row += padding[len(row):]
+            for index, name in checks:
+                if not row[index]:
+                    raise TSVError(f"{path}, line {reader.line_num}: blank {name}")
+            yield make(row)
@@ -1,15 +1,36 @@
-"""Crop the horizontal Banff photo into a vertical portrait focused on the person."""
-from PIL import Image
+"""Preview the crops declared in scripts/images.yml.
+
+Each crop is cut from its source under images/ and saved as
+_crop_preview-<name>.jpg in the output directory (default: images/), so a box
+can be checked before optimize_images.py builds the crop's variants. As
+there, a box measured on a different size of image, or reaching outside it,
+is refused.
+"""
+from pathlib import Path
+from PIL import Image, ImageOps
 import sys
+import yaml
+
+from optimize_images import CONFIG, IMAGES, crop_box
 
-SRC = "images/Bio_Photo_Banff.jpg"
-OUT = sys.argv[1] if len(sys.argv) > 1 else "images/_crop_preview.jpg"
+OUT = Path(sys.argv[1]) if len(sys.argv) > 1 else IMAGES
 
-# Crop box (left, top, right, bottom) in the 1920x1280 source.
-# Person stands right-of-center; this frames head-to-hips, vertical ~3:4.
-LEFT, TOP, RIGHT, BOTTOM = 892, 360, 1529, 1210
+with open(CONFIG, encoding="utf-8") as f:
+    crops = yaml.safe_load(f).get("crops") or {}
+if not crops:
+    print(f"No crops configured in {CONFIG.name}")
 
-img = Image.open(SRC)
-crop = img.crop((LEFT, TOP, RIGHT, BOTTOM))
-crop.save(OUT, quality=92)
-print(f"saved {OUT} size={crop.size} aspect={crop.size[0]/crop.size[1]:.3f}")
+refused = 0
+for source, source_crops in crops.items():
+    for crop_config in source_crops:
+        box = crop_box(IMAGES / source, crop_config, crop_config["name"])
+        if box is None:
+            refused += 1
+            continue
+        # Boxes are in the coordinates of the upright image
+        img = ImageOps.exif_transpose(Image.open(IMAGES / source))
+        crop = img.crop(box).convert("RGB")
+        out = OUT / f"_crop_preview-{Path(crop_config['name']).name}.jpg"
+        crop.save(out, quality=92)
+        print(f"saved {out} size={crop.size} aspect={crop.size[0]/crop.size[1]:.3f}")
+sys.exit(1 if refused else 0)
@@ -0,0 +1,314 @@
+"""Build optimized, responsive copies of the raster images under images/.
+
+Every JPEG and PNG under images/ (and every crop declared in
+scripts/images.yml) is resized to the configured widths and written to
+images/optimized/ in its own format plus WebP and, where Pillow can encode
+it, AVIF, as ``<name>-<width>.<ext>``. EXIF, XMP and text chunks are
+dropped; ICC profiles are kept so colors do not shift. Images are processed
+in a process pool.
+
+images/optimized/.manifest.json records a hash of each source's bytes and of
+the settings and code that produced its outputs. Re-runs skip sources whose
+hash is unchanged and whose outputs all exist, and remove the outputs of
+sources and crops that are gone. Files Pillow cannot read (PDF, SVG, ICO)
+are left alone and listed as skipped.
+
+The report lists, per image, the source size, the smallest full-size output
+and the bytes that output saves. A crop is compared against its full-size
+output in the source's format, since it has no source file of its own.
+Crop boxes are in the pixels of the upright image and can record the
+``source_size`` they were measured on; a crop whose source no longer has that
+size, or whose box falls outside it, is skipped with a warning.
+
+The outputs are not committed (images/optimized/ is ignored) and no
+template references them yet, so the site still serves the originals. To
+serve them, run this before the Jekyll build and point the templates at the
+variants, e.g. with <picture> and srcset.
+
+Run from the repository root:
+    python scripts/optimize_images.py [--full] [--workers N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+from PIL import Image, ImageOps, features
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+IMAGES = ROOT / "images"
+OUTPUT = IMAGES / "optimized"
+CONFIG = Path(__file__).with_name("images.yml")
+MANIFEST = ".manifest.json"
+
+SOURCE_SUFFIXES = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png"}
+SKIPPED_SUFFIXES = {".pdf", ".svg", ".ico"}
+EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp", "avif": "avif"}
+ORIENTATION = 0x0112  # EXIF tag
+
+
+def available_formats(formats):
+    """The configured extra formats this Pillow build can write."""
+    usable = []
+    for fmt in formats:
+        if fmt == "avif" and not features.check("avif"):
+            print("AVIF is not available in this Pillow build; skipping it")
+            continue
+        usable.append(fmt)
+    return usable
+
+
+def find_sources(images, output):
+    """(raster sources, skipped files) under images, relative, excluding output."""
+    sources, skipped = [], []
+    for path in sorted(images.rglob("*")):
+        if not path.is_file() or output in path.parents:
+            continue
+        suffix = path.suffix.lower()
+        if suffix in SOURCE_SUFFIXES:
+            sources.append(path.relative_to(images).as_posix())
+        elif suffix in SKIPPED_SUFFIXES:
+            skipped.append(path.relative_to(images).as_posix())
+    return sources, skipped
+
+
+def crop_box(path, crop, name):
+    """The crop's box if it fits the image at path as displayed, else None (with a warning)."""
+    with Image.open(path) as img:
+        size = list(img.size)
+        if img.getexif().get(ORIENTATION) in (5, 6, 7, 8):
+            size.reverse()
+    left, top, right, bottom = box = tuple(crop["box"])
+    # A box only fits the image it was measured on
+    if crop.get("source_size", size) != size:
+        print(f"Skipping crop {name}: its box is for a {crop['source_size'][0]}x{crop['source_size'][1]} "
+              f"image but {path.name} is {size[0]}x{size[1]}")
+        return None
+    if not (0 <= left < right <= size[0] and 0 <= top < bottom <= size[1]):
+        print(f"Skipping crop {name}: box {list(box)} is outside the {size[0]}x{size[1]} image {path.name}")
+        return None
+    return box
+
+
+def plan_jobs(images, sources, config):
+    """One job per output image: (name, source, crop box or None)."""
+    crops = config.get("crops") or {}
+    unknown = set(crops) - set(sources)
+    if unknown:
+        raise SystemExit(f"crops configured for missing images: {', '.join(sorted(unknown))}")
+    jobs = []
+    for source in sources:
+        stem = source.rsplit(".", 1)[0]
+        jobs.append((stem, source, None))
+        for crop in crops.get(source, ()):
+            directory = stem.rpartition("/")[0]
+            name = f"{directory}/{crop['name']}" if directory else crop["name"]
+            box = crop_box(images / source, crop, name)
+            if box is not None:
+                jobs.append((name, source, box))
+    return jobs
+
+
+def target_widths(width, widths):
+    """Widths to produce for an image `width` pixels wide, never upscaling."""
+    largest = min(width, max(widths))
+    return sorted({w for w in widths if w < largest} | {largest})
+
+
+def strip_metadata(img):
+    """img upright, without EXIF/XMP/text chunks; returns (image, ICC profile or None)."""
+    img = ImageOps.exif_transpose(img)
+    icc = img.info.get("icc_profile")
+    # Palette transparency is image data, not metadata
+    img.info = {key: img.info[key] for key in ("transparency",) if key in img.info}
+    return img, icc
+
+
+def save_options(fmt, quality, icc):
+    options = {"icc_profile": icc} if icc else {}
+    if fmt == "jpeg":
+        options.update(quality=quality["jpeg"], optimize=True, progressive=True)
+    elif fmt == "png":
+        options.update(optimize=True)
+    elif fmt == "webp":
+        options.update(quality=quality["webp"], method=6)
+    elif fmt == "avif":
+        options.update(quality=quality["avif"])
+    return options
+
+
+def convert_for(img, fmt):
+    """img in a mode the format can encode."""
+    if fmt == "jpeg":
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            background = Image.new("RGB", img.size, "white")
+            rgba = img.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            return background
+        return img if img.mode in ("RGB", "L") else img.convert("RGB")
+    if fmt == "png":
+        return img
+    # WebP and AVIF want RGB(A)
+    has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+    mode = "RGBA" if has_alpha else "RGB"
+    return img if img.mode == mode else img.convert(mode)
+
+
+def save_atomic(img, path, fmt, options):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            img.save(f, format=fmt.upper(), **options)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def process(job):
+    """Write every variant of one output image; returns its manifest record."""
+    name, source, box, settings, images, output = job
+    with Image.open(images / source) as opened:
+        source_format = SOURCE_SUFFIXES[Path(source).suffix.lower()]
+        img, icc = strip_metadata(opened)
+        img.load()
+    if box is not None:
+        img = img.crop(box)
+    if img.mode == "P" or img.mode == "CMYK":
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+    outputs = []
+    for width in target_widths(img.width, settings["widths"]):
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        for fmt in [source_format] + settings["formats"]:
+            path = output / f"{name}-{width}.{EXTENSIONS[fmt]}"
+            save_atomic(convert_for(resized, fmt), path, fmt, save_options(fmt, settings["quality"], icc))
+            outputs.append({"file": path.relative_to(output).as_posix(), "width": width,
+                            "format": fmt, "bytes": path.stat().st_size})
+    if box is None:
+        baseline = (images / source).stat().st_size
+    else:
+        # A crop has no file of its own; compare against its plain re-encode
+        baseline = next(o["bytes"] for o in reversed(outputs) if o["format"] == source_format)
+    return {"source": source, "crop": list(box) if box else None, "bytes": baseline, "outputs": outputs}
+
+
+def fingerprint(path, box, settings_hash):
+    digest = hashlib.sha256(settings_hash.encode())
+    digest.update(json.dumps(box).encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(output):
+    try:
+        with open(output / MANIFEST, encoding="utf-8") as f:
+            return json.load(f).get("images", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output, images):
+    output.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=output, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"images": images}, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, output / MANIFEST)
+
+
+def best_full_size(record):
+    """The smallest output at the image's largest width."""
+    largest = max(o["width"] for o in record["outputs"])
+    return min((o for o in record["outputs"] if o["width"] == largest), key=lambda o: o["bytes"])
+
+
+def report(manifest, processed, skipped):
+    rows = []
+    total_source = total_best = 0
+    for name, record in sorted(manifest.items()):
+        best = best_full_size(record)
+        saved = record["bytes"] - best["bytes"]
+        total_source += record["bytes"]
+        total_best += best["bytes"]
+        rows.append((name, record["bytes"], best["format"], best["bytes"], saved,
+                     "built" if name in processed else "unchanged"))
+    width = max([len(row[0]) for row in rows] + [5])
+    print(f"{'image':<{width}} {'source':>10} {'best':>6} {'bytes':>10} {'saved':>10} {'':>6}")
+    for name, source_bytes, fmt, best_bytes, saved, status in rows:
+        percent = 100 * saved / source_bytes if source_bytes else 0
+        print(f"{name:<{width}} {source_bytes:>10,} {fmt:>6} {best_bytes:>10,} {saved:>10,} {percent:>5.0f}%  {status}")
+    if total_source:
+        print(f"{'total':<{width}} {total_source:>10,} {'':>6} {total_best:>10,} "
+              f"{total_source - total_best:>10,} {100 * (total_source - total_best) / total_source:>5.0f}%")
+    for path in skipped:
+        print(f"skipped {path}: not a raster image Pillow can read")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build optimized, responsive copies of images/")
+    parser.add_argument("--full", action="store_true", help="rebuild every image, even unchanged ones")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--config", type=Path, default=CONFIG, help="settings file (default: scripts/images.yml)")
+    parser.add_argument("--images", type=Path, default=IMAGES, help="source directory (default: images/)")
+    parser.add_argument("--output", type=Path, default=None, help="output directory (default: <images>/optimized)")
+    args = parser.parse_args(argv)
+    images = args.images.resolve()
+    output = (args.output or images / "optimized").resolve()
+
+    with open(args.config, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    settings = {
+        "widths": sorted(config["widths"]),
+        "formats": available_formats(config.get("formats", [])),
+        "quality": config["quality"],
+    }
+    code_hash = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    settings_hash = code_hash + json.dumps(settings, sort_keys=True)
+
+    sources, skipped = find_sources(images, output)
+    # --full still needs the old manifest to remove outputs of vanished sources
+    previous = load_manifest(output)
+    manifest = {}
+    pending = []
+    for name, source, box in plan_jobs(images, sources, config):
+        digest = fingerprint(images / source, box, settings_hash)
+        old = previous.get(name)
+        if (not args.full and old is not None and old["hash"] == digest
+                and all((output / o["file"]).exists() for o in old["outputs"])):
+            manifest[name] = old
+            continue
+        pending.append((name, digest, (name, source, box, settings, images, output)))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for (name, digest, _), record in zip(pending, pool.map(process, [job for *_, job in pending])):
+            record["hash"] = digest
+            manifest[name] = record
+
+    # Remove outputs nothing produces any more: deleted sources, renamed crops, dropped widths
+    current = {o["file"] for record in manifest.values() for o in record["outputs"]}
+    removed = 0
+    for record in previous.values():
+        for o in record["outputs"]:
+            path = output / o["file"]
+            if o["file"] not in current and path.exists():
+                path.unlink()
+                removed += 1
+
+    save_manifest(output, manifest)
+    report(manifest, {name for name, *_ in pending}, skipped)
+    print(f"{len(manifest)} images: {len(manifest) - len(pending)} unchanged, {len(pending)} built, "
+          f"{removed} stale outputs removed, {len(skipped)} files skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Asyncio runtime for the conference scrapers
+
+An alternative to scrape_sources' thread pool for long source lists, where
+most of the wall time is spent waiting on many pages from a few hosts.
+
+- A source whose module defines ``parse(url, html)`` is crawled page by page
+  (see crawl): its seed URLs are fetched concurrently, each body is parsed
+  as soon as it arrives, and the links its CrawlRule allows are queued
+  straight away. Sources that only define ``scrape()`` run whole in a
+  thread, as they do under the thread-pool runtime.
+- Fetches go through utils.fetch(), so the response cache, retries and
+  circuit breakers behave as usual. There is no async HTTP client among the
+  scraper's dependencies, so each request runs on an I/O thread. The event
+  loop decides when a request may start: at most ``host_concurrency``
+  requests per host are in flight and they start at most ``host_rps`` per
+  second per host.
+- parse() runs in a process pool so regex-heavy pages do not contend for the
+  GIL with the fetch threads. ``parse_workers=0`` parses on the I/O threads.
+  Stage timings recorded in a parser process are sent back with the records
+  and merged into the run report, and its exceptions come back as
+  ParseError with the original exception's repr.
+
+Threads cannot be interrupted, so a fetch belonging to an abandoned source
+finishes in the background and its result is discarded.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+
+import metrics
+import resilience
+from crawl import Frontier
+from sources import SourceSpec
+from utils import FetchError, Page, fetch
+
+logger = logging.getLogger(__name__)
+
+FETCH_THREADS = 32
+
+
+class ParseError(Exception):
+    """parse() raised in a parser process; the message is the exception's repr."""
+
+
+def parse_in_process(parse: Callable, url: str,
+                     html: str) -> Tuple[Optional[List[Dict]], Dict, Dict, Optional[str]]:
+    """
+    Run ``parse`` in a parser process.
+
+    Metrics recorded there go to the process's own report, so they are
+    returned as (records, stage times, counters, error) for the caller to
+    merge. ``error`` is the repr of the exception parse raised, else None.
+    """
+    metrics.report.reset()
+    records, error = None, None
+    try:
+        records = parse(url, html)
+    except Exception as e:
+        error = repr(e)
+    stages, counters = metrics.report.totals()
+    return records, stages, counters, error
+
+
+class HostLimiter:
+    """Per-host cap on requests in flight and on request start rate."""
+
+    def __init__(self, concurrency: int, rps: float):
+        self.concurrency = max(1, concurrency)
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait until a request to ``url``'s host may start."""
+        host = resilience.host_of(url)
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            # Single-threaded event loop: reserving the start time needs no lock
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                metrics.count('rate_limited')
+                await asyncio.sleep(start - now)
+            yield
+
+
+class AsyncRuntime:
+    """Fetch and parse the pages of many sources on one event loop."""
+
+    def __init__(self, host_concurrency: int = 2, host_rps: float = 2.0,
+                 parse_workers: Optional[int] = None, fetch_threads: int = FETCH_THREADS):
+        self.host_concurrency = host_concurrency
+        self.host_rps = host_rps
+        self.parse_workers = min(4, os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.fetch_threads = fetch_threads
+        self._io = None
+        self._parsers = None
+        self._limiter = None
+
+    def run(self, sources: List[SourceSpec], source_timeout: float,
+            total_timeout: float) -> Dict[str, List[Dict]]:
+        """
+        Scrape ``sources`` and return the raw conferences of those that finished.
+
+        ``source_timeout`` covers everything a source does, including time
+        spent waiting for its hosts' rate limits.
+        """
+        self._io = ThreadPoolExecutor(max_workers=self.fetch_threads, thread_name_prefix='fetch')
+        if self.parse_workers > 0:
+            # spawn, not fork: the fetch threads may hold locks at fork time
+            self._parsers = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        try:
+            return asyncio.run(self._run_all(sources, source_timeout, total_timeout))
+        finally:
+            self._io.shutdown(wait=False, cancel_futures=True)
+            if self._parsers is not None:
+                self._parsers.shutdown(wait=False, cancel_futures=True)
+            self._io = self._parsers = None
+
+    async def _run_all(self, sources: List[SourceSpec], source_timeout: float,
+                       total_timeout: float) -> Dict[str, List[Dict]]:
+        self._limiter = HostLimiter(self.host_concurrency, self.host_rps)
+        tasks = {asyncio.create_task(self._run_source(spec, source_timeout)): spec.short_name
+                 for spec in sources}
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=total_timeout)
+        for task in pending:
+            task.cancel()
+            logger.error(f"  Abandoned {tasks[task]}: run exceeded {total_timeout:.0f}s total timeout")
+        if pending:
+            await asyncio.wait(pending)
+
+        results = {}
+        for task in done:
+            records = task.result()
+            if records is not None:
+                results[tasks[task]] = records
+        return results
+
+    async def _run_source(self, spec: SourceSpec, timeout: float) -> Optional[List[Dict]]:
+        with metrics.source_context(spec.short_name), metrics.stage('total'):
+            logger.info(f"Attempting to scrape {spec.short_name}...")
+            try:
+                return await asyncio.wait_for(self._scrape_source(spec), timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"  Abandoned {spec.short_name}: exceeded {timeout:.0f}s source timeout")
+            except ImportError as e:
+                logger.warning(f"  Scraper module for {spec.short_name} not found ({e})")
+            except Exception as e:
+                logger.error(f"  Error scraping {spec.short_name}: {e}")
+            finally:
+                resilience.finish_source(spec.short_name)
+            return None
+
+    async def _scrape_source(self, spec: SourceSpec) -> List[Dict]:
+        module = await self._in_thread(spec.load)
+        parse = getattr(module, 'parse', None)
+        if parse is None:
+            return await self._in_thread(spec.scrape)
+
+        parser = await self._in_thread(spec.parser_version)
+        frontier = Frontier(spec.urls, spec.follow)
+        results: Dict[str, List[Dict]] = {}
+
+        async def visit(url: str, depth: int) -> None:
+            page, results[url] = await self._scrape_page(spec, parse, parser, url)
+            if page is not None:
+                links = frontier.follow(url, page.text, depth)
+                await asyncio.gather(*(visit(link, depth + 1) for link in links))
+
+        await asyncio.gather(*(visit(url, 0) for url in frontier.start()))
+        return frontier.merge(results)
+
+    async def _scrape_page(self, spec: SourceSpec, parse: Callable, parser: str,
+                           url: str) -> Tuple[Optional[Page], List[Dict]]:
+        try:
+            async with self._limiter.slot(url):
+                page = await self._in_thread(partial(fetch, url, parser=parser))
+        except FetchError as e:
+            logger.error(f"Network error scraping {spec.short_name} ({url}): {e}")
+            return None, []
+
+        cached = page.cached_records()
+        if cached is not None:
+            logger.info(f"{spec.short_name}: {url} unchanged; reusing {len(cached)} cached conferences")
+            return page, cached
+
+        try:
+            with metrics.stage('parse'):
+                if self._parsers is not None:
+                    loop = asyncio.get_running_loop()
+                    records, stages, counters, error = await loop.run_in_executor(
+                        self._parsers, parse_in_process, parse, url, page.text)
+                    metrics.report.merge(stages, counters)
+                    if error is not None:
+                        raise ParseError(error)
+                else:
+                    records = await self._in_thread(parse, url, page.text)
+        except Exception as e:
+            logger.error(f"Error scraping {spec.short_name} ({url}): {e}")
+            return page, []
+        page.store_records(records)
+        return page, records
+
+    def _in_thread(self, func: Callable, *args):
+        """Run ``func`` on an I/O thread, keeping the current source attribution."""
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(self._io, partial(context.run, func, *args))
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the conference scraper
+
+Each benchmark compares the current implementation against a copy of the code
+it replaced, on synthetic input, and prints timings.
+
+Usage:
+    python benchmark.py dates [--count N]
+    python benchmark.py merge [--count N]
+    python benchmark.py yaml [--count N]
+    python benchmark.py diff [--count N]
+    python benchmark.py dedupe [--series N]
+    python benchmark.py html [--pages DIR]
+    python benchmark.py runtime [--pages N] [--hosts N] [--latency S]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import utils
+
+
+def timed(label: str, func: Callable, repeat: int = 3) -> float:
+    """Run ``func`` ``repeat`` times and print the best wall time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.2f} ms")
+    return best
+
+
+# --- dates -------------------------------------------------------------------
+
+def _legacy_parse_single_date(date_str: str, default_year: int) -> Optional[str]:
+    """parse_single_date as it was before the cached fast path."""
+    import re
+    date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
+    formats = [
+        ('%B %d, %Y', True),
+        ('%B %d %Y', True),
+        ('%b %d, %Y', True),
+        ('%b %d %Y', True),
+        ('%B %d', False),
+        ('%b %d', False),
+    ]
+    for fmt, has_year in formats:
+        try:
+            dt = datetime.strptime(date_str.strip(), fmt)
+            if not has_year:
+                dt = dt.replace(year=default_year)
+            return dt.strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def _legacy_normalize_date(date_str: str):
+    """normalize_date's string branch as it was before the cached fast path."""
+    import re
+    date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
+    for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y']:
+        try:
+            return datetime.strptime(date_str.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def bench_dates(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    months = ['January', 'Feb', 'March', 'Apr', 'May', 'June', 'Jul', 'August', 'Sep', 'October']
+    # A page-sized vocabulary of candidates, repeated the way year loops repeat them
+    vocabulary = [f"{rng.choice(months)} {rng.randint(1, 28)}{rng.choice(['', 'th'])}, "
+                  f"{rng.randint(2024, 2028)}" for _ in range(200)]
+    vocabulary += [f"{rng.choice(months)} {rng.randint(1, 28)}" for _ in range(50)]
+    candidates = [rng.choice(vocabulary) for _ in range(args.count)]
+    iso = [f"{rng.randint(2024, 2028)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+           for _ in range(60)]
+    stored = [rng.choice(iso) for _ in range(args.count)]
+
+    mismatches = sum(_legacy_parse_single_date(c, 2026) != utils.parse_single_date(c, 2026)
+                     for c in vocabulary)
+    print(f"dates: {args.count} candidates, {len(vocabulary)} distinct; "
+          f"{mismatches} result mismatches vs legacy")
+
+    legacy = timed('legacy parse_single_date', lambda: [_legacy_parse_single_date(c, 2026) for c in candidates])
+
+    timed('fast path, no cache', lambda: [utils.parse_single_date.__wrapped__(c, 2026)
+                                          for c in candidates])
+
+    def cold():
+        utils.parse_single_date.cache_clear()
+        utils.parse_dates(candidates, 2026)
+    timed('parse_dates (cold cache)', cold)
+    warm = timed('parse_dates (warm cache)', lambda: utils.parse_dates(candidates, 2026))
+    print(f"  speedup (warm): {legacy / warm:.1f}x")
+
+    legacy = timed('legacy normalize_date (ISO)', lambda: [_legacy_normalize_date(d) for d in stored])
+    current = timed('normalize_dates (ISO)', lambda: utils.normalize_dates(stored))
+    print(f"  speedup: {legacy / current:.1f}x")
+
+
+# --- merge -------------------------------------------------------------------
+
+def _legacy_merge_conferences(scraped, manual):
+    """merge_conferences as it was before merge_layers."""
+    merged = {}
+    for conf in scraped:
+        key = (conf.get('short_name'), conf.get('year'))
+        merged[key] = conf.copy()
+    for conf in manual:
+        key = (conf.get('short_name'), conf.get('year'))
+        if key in merged:
+            merged[key].update({k: v for k, v in conf.items() if v is not None})
+        else:
+            merged[key] = conf.copy()
+    return list(merged.values())
+
+
+def synthetic_conferences(count: int, seed: int = 0, source: str = 'scraped'):
+    """Conference dicts shaped like _data/conferences.yml entries."""
+    rng = random.Random(seed)
+    conferences = []
+    for i in range(count):
+        year = 2024 + i % 5
+        start = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 25):02d}"
+        conferences.append({
+            'name': f"Conference {i // 5} {year}",
+            'short_name': f"C{i // 5}",
+            'field': rng.choice(['finance', 'accounting']),
+            'category': rng.choice(['major', 'regional', 'specialized']),
+            'year': year,
+            'conference_dates': {'start': start, 'end': rng.choice([start, None])},
+            'location': rng.choice(['Chicago, IL', 'Boston, MA', None]),
+            'submission_deadline': f"{year - 1}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'website': f"https://example.org/c{i // 5}",
+            'source': source,
+        })
+    return conferences
+
+
+def bench_merge(args: argparse.Namespace) -> None:
+    existing = synthetic_conferences(args.count, seed=1, source='scraped')
+    scraped = [synthetic_conferences(args.count // 5, seed=2 + i) for i in range(5)]
+    manual = synthetic_conferences(args.count // 10, seed=9, source='manual')
+    print(f"merge: {args.count} existing, 5 x {args.count // 5} scraped, {len(manual)} manual")
+
+    def legacy():
+        combined = existing
+        for layer in scraped:
+            combined = _legacy_merge_conferences(combined, layer)
+        _legacy_merge_conferences(combined, manual)
+
+    layers = [('existing', existing)] + [(f"scraped:{i}", layer) for i, layer in enumerate(scraped)]
+    layers.append(('manual', manual))
+
+    before = timed('legacy pairwise merge_conferences', legacy)
+    after = timed('merge_layers (with provenance)', lambda: utils.merge_layers(layers))
+    print(f"  speedup: {before / after:.1f}x")
+
+
+# --- yaml --------------------------------------------------------------------
+
+def bench_yaml(args: argparse.Namespace) -> None:
+    import tempfile
+    import yaml
+    import scrape_conferences
+
+    conferences = synthetic_conferences(args.count)
+    metadata = {'last_updated': datetime.now().isoformat(), 'scraper_version': '1.0.0',
+                'total_conferences': len(conferences)}
+    print(f"yaml: {args.count} conferences, libyaml "
+          f"{'available' if scrape_conferences.YamlDumper is not yaml.SafeDumper else 'NOT available'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = Path(tmp) / 'legacy.yml'
+        current_file = Path(tmp) / 'conferences.yml'
+
+        def legacy_dump():
+            with open(legacy_file, 'w') as f:
+                yaml.dump({'metadata': metadata, 'conferences': conferences}, f,
+                          default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+        before = timed('legacy yaml.dump (pure Python)', legacy_dump, repeat=1)
+        after = timed('write_conferences (streamed, atomic)',
+                      lambda: scrape_conferences.write_conferences(current_file, metadata, conferences),
+                      repeat=1)
+        print(f"  speedup: {before / after:.1f}x; identical output: "
+              f"{legacy_file.read_bytes() == current_file.read_bytes()}")
+
+        def legacy_load():
+            with open(legacy_file) as f:
+                yaml.safe_load(f)
+
+        before = timed('legacy yaml.safe_load', legacy_load, repeat=1)
+        after = timed('load_existing_conferences', lambda: scrape_conferences.load_existing_conferences(Path(tmp)),
+                      repeat=1)
+        print(f"  speedup: {before / after:.1f}x")
+
+
+# --- diff --------------------------------------------------------------------
+
+def bench_diff(args: argparse.Namespace) -> None:
+    from changes import diff_conferences
+
+    print("diff: time per record should stay flat as the input grows")
+    for count in (args.count, 2 * args.count, 4 * args.count):
+        old = synthetic_conferences(count, seed=1)
+        new = [dict(conf) for conf in old]
+        rng = random.Random(count)
+        # Move 1% of deadlines, drop 1% of records and shuffle, as a re-sort would
+        for conf in rng.sample(new, count // 100):
+            conf['submission_deadline'] = '2030-01-01'
+        new = new[count // 100:] + synthetic_conferences(count // 100, seed=2)
+        rng.shuffle(new)
+        for conf in new:
+            conf['last_verified'] = '2030-01-01'
+        elapsed = timed(f"diff_conferences, {count} records", lambda: diff_conferences(old, new))
+        changes = diff_conferences(old, new)
+        print(f"    {elapsed / count * 1e6:.2f} us/record, {len(changes)} changes")
+
+
+# --- dedupe ------------------------------------------------------------------
+
+_REGIONS = ['Western', 'Eastern', 'Midwest', 'Northern', 'Southern', 'European', 'Asian', 'Pacific',
+            'Atlantic', 'Nordic', 'Alpine', 'Texas', 'Hawaii', 'China', 'London', 'Paris', 'Toronto',
+            'Boston', 'Chicago', 'Tokyo', 'Iberian', 'Baltic', 'Andean', 'Gulf', 'Rocky Mountain']
+_TOPICS = ['Finance', 'Accounting', 'Financial Intermediation', 'Corporate Finance', 'Asset Pricing',
+           'Banking', 'Auditing', 'Tax', 'Behavioral Finance', 'Financial Reporting',
+           'Market Microstructure', 'Derivatives', 'Risk Management', 'Real Estate',
+           'Household Finance', 'Fintech', 'Governance', 'Valuation', 'Macro Finance', 'Econometrics']
+_KINDS = ['Association', 'Society', 'Symposium', 'Workshop', 'Research Conference', 'Forum',
+          'Colloquium', 'Summit']
+
+
+def synthetic_duplicates(series: int, seed: int = 0):
+    """
+    Conference records with near-duplicates, and the true meeting of each.
+
+    Every series runs for two or three years at about the same time, and one in
+    ten is an umbrella of sessions sharing a website and dates under
+    different short names; both must stay apart. A third of the meetings are
+    reported again with a respelled short name, a reworded name, another
+    form of the website, the year of the deadline instead of the meeting, or
+    without dates. The year is only changed when no other edition has it,
+    since merge_layers already joins records with equal keys, and a record
+    under the wrong year carries a stale venue, notification date and
+    cfp_url that must not reach the merged meeting, and notes that may.
+    """
+    from datetime import date, timedelta
+
+    rng = random.Random(seed)
+    records, truth = [], []
+    used = set()
+    for s in range(series):
+        while True:
+            words = [rng.choice(_REGIONS), rng.choice(_TOPICS), rng.choice(_KINDS)]
+            name = ' '.join(words)
+            if name not in used:
+                used.add(name)
+                break
+        short = ''.join(w[0] for w in ' '.join(words).split()) + str(s)
+        slug = name.lower().replace(' ', '')
+        sessions = [(short, name)]
+        if s % 10 == 0:
+            sessions = [(f"{short}-SI-{t[:2].upper()}{i}", f"{name} Summer Institute {t}")
+                        for i, t in enumerate(rng.sample(_TOPICS, 3))]
+        first_year = rng.randint(2020, 2026)
+        years = range(first_year, first_year + rng.randint(2, 3))
+        # Meetings recur at about the same time of year
+        month, day = rng.randint(1, 12), rng.randint(1, 25)
+        for year in years:
+            start = date(year, month, day) + timedelta(days=rng.randint(-10, 10))
+            end = start + timedelta(days=rng.randint(0, 3))
+            deadline = start - timedelta(days=rng.randint(90, 200))
+            for short_name, session_name in sessions:
+                meeting = len(set(truth))
+                base = {
+                    'name': f"{session_name} {year}", 'short_name': short_name, 'year': year,
+                    'conference_dates': {'start': start.isoformat(), 'end': end.isoformat()},
+                    'submission_deadline': deadline.isoformat(),
+                    'website': f"https://www.{slug}.org/" + ('si/' if len(sessions) > 1 else ''),
+                }
+                base['cfp_url'] = base['website'] + 'cfp'
+                records.append(base)
+                truth.append(meeting)
+                if rng.random() >= 1 / 3:
+                    continue
+                for _ in range(rng.randint(1, 2)):
+                    dup = dict(base, conference_dates=dict(base['conference_dates']))
+                    change = rng.choice(['short', 'name', 'website', 'year', 'nodates'])
+                    if change == 'year' and deadline.year in years:
+                        change = 'short'
+                    if change == 'short':
+                        dup['short_name'] = rng.choice([short_name.lower(), short_name.replace('-', ' '),
+                                                        f"{short_name} Meeting"])
+                    elif change == 'name':
+                        dup['name'] = rng.choice([f"{year} {session_name} Annual Meeting",
+                                                  f"{rng.randint(2, 40)}th {session_name}",
+                                                  session_name])
+                    elif change == 'website':
+                        dup['website'] = dup['website'].replace('https://www.', 'http://') + 'call-for-papers'
+                    elif change == 'year':
+                        # A page still showing last edition's venue and results date
+                        dup['year'] = deadline.year
+                        dup['venue'] = f"Stale venue of {short_name} {year - 1}"
+                        dup['notification_date'] = (deadline - timedelta(days=300)).isoformat()
+                        dup['cfp_url'] = f"Stale call of {short_name} {year - 1}"
+                        dup['notes'] = 'Reported under the deadline year'
+                    else:
+                        dup['conference_dates'] = {'start': None, 'end': None}
+                    records.append(dup)
+                    truth.append(meeting)
+    order = list(range(len(records)))
+    rng.shuffle(order)
+    return [records[i] for i in order], [truth[i] for i in order]
+
+
+def _all_pairs_duplicates(conferences):
+    """find_duplicates without the index: every pair is compared."""
+    from dedupe import is_duplicate, profile
+
+    profiles = [profile(conf) for conf in conferences]
+    parent = list(range(len(conferences)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i in range(len(profiles)):
+        for j in range(i + 1, len(profiles)):
+            if is_duplicate(profiles[i], profiles[j]):
+                parent[max(find(i), find(j))] = min(find(i), find(j))
+    groups = {}
+    for i in range(len(conferences)):
+        groups.setdefault(find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _pairs(groups):
+    return {(i, j) for group in groups for n, i in enumerate(sorted(group)) for j in sorted(group)[n + 1:]}
+
+
+def bench_dedupe(args: argparse.Namespace) -> None:
+    from dedupe import dedupe_layers, find_duplicates
+
+    conferences, truth = synthetic_duplicates(args.series)
+    meetings = {}
+    for i, meeting in enumerate(truth):
+        meetings.setdefault(meeting, []).append(i)
+    expected = _pairs(meetings.values())
+    print(f"dedupe: {len(conferences)} records of {len(meetings)} meetings, "
+          f"{len(expected)} duplicate pairs")
+
+    groups = []
+    after = timed('find_duplicates (blocked index)', lambda: groups.append(find_duplicates(conferences)))
+    found = _pairs(groups[-1])
+    true_positives = len(found & expected)
+    print(f"    precision {true_positives / max(len(found), 1):.4f}, "
+          f"recall {true_positives / max(len(expected), 1):.4f}")
+    if not args.skip_all_pairs:
+        reference = []
+        before = timed('all-pairs comparison', lambda: reference.append(_all_pairs_duplicates(conferences)),
+                       repeat=1)
+        print(f"  speedup: {before / after:.1f}x; same groups: "
+              f"{_pairs(reference[-1]) == found}")
+
+    # Merged meetings must not pick up details of another edition, nor the
+    # position of a duplicate listed before the kept record
+    from changes import conference_key
+
+    layers, duplicates = dedupe_layers([('scraped', conferences)])
+    merged, _ = utils.merge_layers(layers)
+    leaks = sum(1 for conf in merged
+                if str(conf.get('venue') or '').startswith('Stale')
+                or str(conf.get('cfp_url') or '').startswith('Stale')
+                or (conf.get('notification_date') or '9999') < (conf.get('submission_deadline') or ''))
+    filled = sum(1 for conf in merged if conf.get('notes'))
+    absorbed = {key for others in duplicates.values() for key in others}
+    kept_order = list(dict.fromkeys(key for key in map(conference_key, conferences) if key not in absorbed))
+    print(f"  {len(merged)} merged conferences, {leaks} with another edition's venue, notification date "
+          f"or cfp_url, {filled} with notes filled in from a duplicate; in kept records' order: "
+          f"{[conference_key(conf) for conf in merged] == kept_order}")
+
+
+# --- html --------------------------------------------------------------------
+
+FIXTURE_PAGES_DIR = Path(__file__).parent / 'fixtures' / 'pages'
+
+
+def synthetic_page(sections: int = 400) -> str:
+    """A society-site-like page: nav, inline scripts, tables and prose."""
+    rng = random.Random(0)
+    nav = ''.join(f'<li><a href="/p{i}">Page {i}</a></li>' for i in range(60))
+    body = []
+    for i in range(sections):
+        body.append(f'<section><h2>Session {i}</h2><script>window.dataLayer.push({{id: {i}}});</script>'
+                    f'<p>The 2027 Annual Meeting takes place January {rng.randint(1, 5)}-'
+                    f'{rng.randint(6, 9)}, 2027 in New Orleans, LA. '
+                    f'Submission deadline: August {rng.randint(1, 28)}, 2026.</p>'
+                    f'<table><tr><td>Chair</td><td>Discussant {i}</td></tr></table></section>')
+    return (f'<html><head><title>Meetings</title><style>.x{{color:red}}</style></head>'
+            f'<body><nav><ul>{nav}</ul></nav>{"".join(body)}</body></html>')
+
+
+def bench_html(args: argparse.Namespace) -> None:
+    import tracemalloc
+
+    paths = sorted(Path(args.pages).glob('**/*.html')) if args.pages else []
+    if paths:
+        pages = [(str(p.relative_to(args.pages)), p.read_text(encoding='utf-8', errors='replace')) for p in paths]
+    else:
+        pages = [('synthetic', synthetic_page())]
+        print(f"html: no saved pages under {args.pages}; using a synthetic page")
+
+    def measure(func, html):
+        func(html)  # warm-up, so lazy imports are not counted
+        tracemalloc.start()
+        func(html)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            func(html)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, peak
+
+    print(f"  {'page':<36} {'KB':>7} {'soup ms':>9} {'fast ms':>9} {'soup MB':>9} {'fast MB':>9}")
+    for name, html in pages:
+        soup_time, soup_peak = measure(lambda h: utils.page_text(h, fast=False), html)
+        fast_time, fast_peak = measure(utils.html_to_text, html)
+        print(f"  {name[-36:]:<36} {len(html) / 1024:7.0f} {soup_time * 1000:9.1f} {fast_time * 1000:9.1f} "
+              f"{soup_peak / 2**20:9.2f} {fast_peak / 2**20:9.2f}")
+    print("  (peak MB is Python-heap memory from tracemalloc)")
+
+
+# --- runtime -----------------------------------------------------------------
+
+_runtime_extractor = None
+
+
+def parse(url: str, html: str):
+    """Stand-in source parser used by the runtime benchmark's sources."""
+    global _runtime_extractor
+    import re
+    from extract import Extractor
+
+    if _runtime_extractor is None:
+        _runtime_extractor = Extractor(
+            year=re.compile(r'(\d{4}) Annual Meeting'),
+            date_range=re.compile(r'(\w+\s+\d+[-–]\d+,?\s*\d{4})'),
+        )
+    # Keyed on the URL so the crawl merge keeps one record per page
+    return [{'short_name': url, **match} for match in _runtime_extractor.extract(utils.html_to_text(html))]
+
+
+def bench_runtime(args: argparse.Namespace) -> None:
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from async_runtime import AsyncRuntime
+    from sources import SourceSpec
+
+    body = synthetic_page(sections=args.sections).encode('utf-8')
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(args.latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *log_args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    utils.set_cache_dir(None)
+    utils.set_replay_server(f"http://127.0.0.1:{server.server_address[1]}")
+
+    per_host = max(1, args.pages // args.hosts)
+    specs = [SourceSpec(f"S{h}", 'benchmark', 'finance',
+                        tuple(f"https://society{h}.test/page{p}" for p in range(per_host)))
+             for h in range(args.hosts)]
+    pages = per_host * args.hosts
+    print(f"runtime: {args.hosts} hosts x {per_host} pages ({len(body) / 1024:.0f} KB), "
+          f"{args.latency * 1000:.0f} ms server latency, {args.host_concurrency} in flight and "
+          f"{args.host_rps:g} req/s per host")
+
+    def sequential():
+        for spec in specs:
+            for url in spec.urls:
+                parse(url, utils.fetch(url).text)
+
+    def run_async(parse_workers):
+        runtime = AsyncRuntime(host_concurrency=args.host_concurrency, host_rps=args.host_rps,
+                               parse_workers=parse_workers)
+        results = runtime.run(specs, source_timeout=600, total_timeout=600)
+        assert sum(len(records) for records in results.values()) == pages
+
+    # Per-host floor: the rate limit, or latency when concurrency is the bottleneck
+    floor = max((per_host - 1) / args.host_rps if args.host_rps > 0 else 0,
+                per_host * args.latency / args.host_concurrency)
+    if not args.skip_sequential:
+        before = timed('sequential fetch + parse', sequential, repeat=1)
+    after = timed('async runtime, parse in threads', lambda: run_async(0), repeat=1)
+    timed('async runtime, parse in processes', lambda: run_async(None), repeat=1)
+    if not args.skip_sequential:
+        print(f"  speedup: {before / after:.1f}x")
+    print(f"  per-host limit floor: {floor * 1000:.0f} ms")
+    server.shutdown()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Scraper micro-benchmarks')
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    dates = sub.add_parser('dates', help='date parsing: legacy strptime loop vs cached fast path')
+    dates.add_argument('--count', type=int, default=50000)
+    dates.set_defaults(func=bench_dates)
+
+    merge = sub.add_parser('merge', help='conference merge: pairwise copies vs merge_layers')
+    merge.add_argument('--count', type=int, default=10000)
+    merge.set_defaults(func=bench_merge)
+
+    yaml_io = sub.add_parser('yaml', help='conferences.yml load/dump: pure Python vs libyaml streaming')
+    yaml_io.add_argument('--count', type=int, default=10000)
+    yaml_io.set_defaults(func=bench_yaml)
+
+    diff = sub.add_parser('diff', help='conference change detection at growing input sizes')
+    diff.add_argument('--count', type=int, default=10000)
+    diff.set_defaults(func=bench_diff)
+
+    dedupe = sub.add_parser('dedupe', help='fuzzy duplicate detection: all pairs vs the blocked index')
+    dedupe.add_argument('--series', type=int, default=600,
+                        help='synthetic conference series (about 5 records each)')
+    dedupe.add_argument('--skip-all-pairs', action='store_true')
+    dedupe.set_defaults(func=bench_dedupe)
+
+    html = sub.add_parser('html', help='page flattening: BeautifulSoup get_text vs streaming html_to_text')
+    html.add_argument('--pages', default=str(FIXTURE_PAGES_DIR),
+                      help='directory of saved .html pages (default: %(default)s)')
+    html.set_defaults(func=bench_html)
+
+    runtime = sub.add_parser('runtime', help='sequential fetching vs the async runtime on a slow local server')
+    runtime.add_argument('--pages', type=int, default=120)
+    runtime.add_argument('--hosts', type=int, default=12)
+    runtime.add_argument('--latency', type=float, default=0.2, help='seconds per response')
+    runtime.add_argument('--sections', type=int, default=40, help='size of each synthetic page')
+    runtime.add_argument('--host-concurrency', type=int, default=2)
+    runtime.add_argument('--host-rps', type=float, default=2.0)
+    runtime.add_argument('--skip-sequential', action='store_true')
+    runtime.set_defaults(func=bench_runtime)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Field-level diff of conference sets and the append-only change log
+
+Each run compares the conferences it is about to write with the ones in the
+current conferences.yml. Records are matched on (short_name, year), as in
+utils.merge_layers, through one dict lookup each, so the diff is linear in
+the number of records. Nested dicts are compared key by key and reported
+with 'parent.child' names, like merge provenance. The per-run last_verified
+stamp is ignored.
+
+Changes are appended to _data/.conference_changes.jsonl, one compact JSON
+object per changed conference:
+
+    {"at":"2026-10-18T06:00:00+00:00","op":"changed","key":["SFS",2027],
+     "fields":{"submission_deadline":["2026-10-01","2026-10-08"]}}
+
+``op`` is "added" (``fields`` holds the new record's values), "changed"
+(``fields`` maps each field to [old, new], None standing for absent) or
+"removed" (no ``fields``). The log is only ever opened for appending, never
+read back; conferences.yml itself is the baseline for the next diff. It is a
+dotfile because Jekyll would try to parse a .jsonl file in _data/ as YAML.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG = '.conference_changes.jsonl'
+
+# Fields rewritten on every run, which would otherwise make every record change
+VOLATILE_FIELDS = ('last_verified',)
+
+
+def conference_key(conf: Dict) -> Tuple:
+    """The (short_name, year) pair records are matched on."""
+    return (conf.get('short_name'), conf.get('year'))
+
+
+def flatten(conf: Dict, ignore: Iterable[str] = VOLATILE_FIELDS) -> Dict[str, Any]:
+    """``conf`` with nested dicts spread into 'parent.child' fields."""
+    flat = {}
+    for field, value in conf.items():
+        if field in ignore:
+            continue
+        if type(value) is dict:
+            for sub_field, sub_value in value.items():
+                flat[f"{field}.{sub_field}"] = sub_value
+        else:
+            flat[field] = value
+    return flat
+
+
+def field_changes(old: Dict, new: Dict) -> Dict[str, List]:
+    """{field: [old value, new value]} for every field that differs; absent counts as None."""
+    changes = {}
+    for field, value in new.items():
+        previous = old.get(field)
+        if previous != value:
+            changes[field] = [previous, value]
+    for field, previous in old.items():
+        if field not in new and previous is not None:
+            changes[field] = [previous, None]
+    return changes
+
+
+def diff_conferences(old: List[Dict], new: List[Dict],
+                     ignore: Iterable[str] = VOLATILE_FIELDS) -> List[Dict]:
+    """
+    Changes turning ``old`` into ``new``, without timestamps.
+
+    Added and changed conferences come in ``new`` order, then removed ones in
+    ``old`` order. If a key occurs twice in ``old``, its last record is
+    the one compared against.
+    """
+    ignore = frozenset(ignore)
+    old_by_key = {conference_key(conf): conf for conf in old}
+    changes = []
+    seen = set()
+    for conf in new:
+        key = conference_key(conf)
+        seen.add(key)
+        previous = old_by_key.get(key)
+        if previous is None:
+            changes.append({'op': 'added', 'key': list(key), 'fields': flatten(conf, ignore)})
+            continue
+        fields = field_changes(flatten(previous, ignore), flatten(conf, ignore))
+        if fields:
+            changes.append({'op': 'changed', 'key': list(key), 'fields': fields})
+    for key in old_by_key:
+        if key not in seen:
+            changes.append({'op': 'removed', 'key': list(key)})
+    return changes
+
+
+def describe_change(change: Dict) -> str:
+    """One line summary of a change for the log."""
+    short_name, year = change['key']
+    if change['op'] == 'changed':
+        details = '; '.join(f"{field} {old!r} -> {new!r}" for field, (old, new) in change['fields'].items())
+        return f"{short_name} {year}: {details}"
+    return f"{short_name} {year} {change['op']}"
+
+
+def log_changes(changes: List[Dict], limit: int = 50) -> None:
+    """Log a count per operation and the first ``limit`` changes."""
+    if not changes:
+        logger.info("No conference changed")
+        return
+    counts: Dict[str, int] = {}
+    for change in changes:
+        counts[change['op']] = counts.get(change['op'], 0) + 1
+    logger.info("Conference changes: " + ', '.join(f"{n} {op}" for op, n in counts.items()))
+    for change in changes[:limit]:
+        logger.info(f"  {describe_change(change)}")
+    if len(changes) > limit:
+        logger.info(f"  ... and {len(changes) - limit} more")
+
+
+def append_changes(path: Path, changes: List[Dict], at: str) -> None:
+    """
+    Append ``changes``, stamped with ``at``, to the JSON Lines log at ``path``.
+
+    The run's lines go out in a single write, which is then fsynced.
+    """
+    if not changes:
+        return
+    lines = ''.join(json.dumps({'at': at, **change}, separators=(',', ':'), ensure_ascii=False, default=str) + '\n'
+                    for change in changes)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+    logger.info(f"Appended {len(changes)} change(s) to {path}")
@@ -0,0 +1,189 @@
+"""
+Bounded crawl of a source's pages
+
+A SourceSpec lists seed URLs and, optionally, a CrawlRule naming the links
+worth following from them (a call-for-papers or program page, say). The
+crawl fetches pages concurrently, canonicalizes every URL and keeps a
+visited set, so each page is fetched at most once per source per run. Each
+page goes through the source's ``parse(url, html)``, and the per-page
+records are merged into one record per (short_name, year). Pages found later
+in the crawl override the fields they state, so the seed page supplies the
+base record and a sub-page's deadline wins over a guess made from the seed.
+
+crawl_source() runs a crawl on a small thread pool for the thread-pool
+runtime; async_runtime drives the same Frontier from its event loop.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html import unescape
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import contextvars
+import logging
+import re
+
+import metrics
+from utils import FetchError, Page, fetch, merge_layers
+
+logger = logging.getLogger(__name__)
+
+CRAWL_WORKERS = 4
+
+_HREF_RE = re.compile(r'<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_TRACKING_PARAMS = re.compile(r'utm_\w+|fbclid|gclid|mc_[ce]id')
+
+
+class CrawlRule:
+    """
+    Which links to follow from a source's seed pages.
+
+    A link is followed when its canonical URL matches ``pattern`` (searched,
+    not anchored), it is at most ``max_depth`` links away from a seed, it is
+    on a seed's host when ``same_host`` is set, and the source has fetched
+    fewer than ``max_pages`` pages.
+    """
+
+    def __init__(self, pattern: str, max_depth: int = 1, same_host: bool = True,
+                 max_pages: int = 20):
+        self.pattern = re.compile(pattern)
+        self.max_depth = max_depth
+        self.same_host = same_host
+        self.max_pages = max_pages
+
+    def __repr__(self) -> str:
+        return f"CrawlRule({self.pattern.pattern!r}, max_depth={self.max_depth})"
+
+
+def canonicalize(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Absolute canonical form of ``url``, or None if it is not an http(s) link.
+
+    Resolves relative links against ``base``, lower-cases scheme and host,
+    drops default ports, fragments and tracking parameters, sorts the query
+    and gives an empty path as '/'.
+    """
+    if base is not None:
+        url = urljoin(base, url)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _TRACKING_PARAMS.fullmatch(k)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """Canonical URLs of the <a href> links in ``html``, in document order."""
+    links = []
+    for match in _HREF_RE.finditer(html):
+        href = unescape(match.group(1) if match.group(1) is not None else match.group(2))
+        if href.startswith(('#', 'mailto:', 'javascript:', 'tel:')):
+            continue
+        url = canonicalize(href, base_url)
+        if url is not None:
+            links.append(url)
+    return links
+
+
+class Frontier:
+    """Visited set and follow decisions for one source's crawl."""
+
+    def __init__(self, seeds: Iterable[str], rule: Optional[CrawlRule] = None):
+        self.rule = rule
+        self.visited: Dict[str, int] = {}  # canonical URL -> discovery order
+        self._seeds = [url for url in (canonicalize(seed) for seed in seeds) if url]
+        self._hosts = {urlsplit(url).netloc for url in self._seeds}
+
+    def start(self) -> List[str]:
+        """Admit the seed URLs; returns those not already visited."""
+        return [url for url in self._seeds if self._admit(url)]
+
+    def follow(self, page_url: str, html: str, depth: int) -> List[str]:
+        """Admit the links on a page at ``depth`` that the rule allows."""
+        rule = self.rule
+        if rule is None or depth >= rule.max_depth:
+            return []
+        admitted = []
+        for url in extract_links(html, page_url):
+            if rule.same_host and urlsplit(url).netloc not in self._hosts:
+                continue
+            if rule.pattern.search(url) and self._admit(url):
+                admitted.append(url)
+        return admitted
+
+    def merge(self, results: Dict[str, List[Dict]]) -> List[Dict]:
+        """Merge per-page records into one per (short_name, year), in crawl order."""
+        pages = sorted(results, key=self.visited.__getitem__)
+        return merge_layers([(url, results[url]) for url in pages])[0]
+
+    def _admit(self, url: str) -> bool:
+        if url in self.visited:
+            metrics.count('crawl_duplicates')
+            return False
+        limit = self.rule.max_pages if self.rule is not None else None
+        if limit is not None and len(self.visited) >= limit:
+            logger.warning(f"  Not following {url}: crawl limit of {limit} pages reached")
+            return False
+        self.visited[url] = len(self.visited)
+        return True
+
+
+def scrape_page(short_name: str, url: str, parse: Callable,
+                parser: Optional[str] = None) -> Tuple[Optional[Page], List[Dict]]:
+    """
+    Fetch one page and parse it, reusing last run's records if it is unchanged
+    and they were extracted by the same ``parser`` version (see fetch).
+
+    Returns (page, records); page is None when the fetch failed. Errors are
+    logged, not raised.
+    """
+    try:
+        page = fetch(url, parser=parser)
+    except FetchError as e:
+        logger.error(f"Network error scraping {short_name} ({url}): {e}")
+        return None, []
+    cached = page.cached_records()
+    if cached is not None:
+        logger.info(f"{short_name}: {url} unchanged; reusing {len(cached)} cached conferences")
+        return page, cached
+    try:
+        records = parse(url, page.text)
+    except Exception as e:
+        logger.error(f"Error scraping {short_name} ({url}): {e}")
+        return page, []
+    page.store_records(records)
+    return page, records
+
+
+def crawl_source(spec, parse: Callable, workers: int = CRAWL_WORKERS) -> List[Dict]:
+    """Crawl ``spec``'s pages on a thread pool and return the merged records."""
+    frontier = Frontier(spec.urls, spec.follow)
+    results: Dict[str, List[Dict]] = {}
+    parser = spec.parser_version()
+
+    def submit(url: str):
+        # Keep the caller's metrics attribution in the pool's threads
+        context = contextvars.copy_context()
+        return pool.submit(context.run, scrape_page, spec.short_name, url, parse, parser)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='crawl') as pool:
+        pending = {submit(url): (url, 0) for url in frontier.start()}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, depth = pending.pop(future)
+                page, results[url] = future.result()
+                if page is not None:
+                    for link in frontier.follow(url, page.text, depth):
+                        pending[submit(link)] = (link, depth + 1)
+
+    return frontier.merge(results)
@@ -0,0 +1,304 @@
+"""
+Fuzzy de-duplication of conference records
+
+utils.merge_layers matches records on the exact (short_name, year) pair, so
+the same meeting reported as "SFS" and "SFS Cavalcade", or under two years
+by a page that mentions both, survives as two conferences. This stage finds
+such records before the merge and gives them one key, so merge_layers then
+combines them with its usual precedence.
+
+Records are indexed by normalized keys: the short name (case and
+punctuation folded) and its tokens, acronyms of the short name and of the
+name, the website's host and first path segment, and the distinctive words
+of the name. Only records sharing a key are compared, and keys held by more
+than MAX_BLOCK records are ignored as uninformative, so the work is bounded
+by MAX_BLOCK comparisons per record instead of growing with the square of
+the record count.
+
+A candidate pair is a duplicate when its dates agree (see dates_compatible)
+and its names do (see names_match). Duplicates are grouped transitively.
+Each group keeps its record from the highest-precedence layer, preferring,
+within a layer, a record whose year matches its start date. The other
+records are removed from the layers: they only fill fields the kept record
+leaves None, so they can neither override it nor become merge_layers' base
+record (and move the conference to their position). Their MEETING_FIELDS are
+never used: a record filed under the wrong year often mixes in details of
+another edition (a venue, a notification date).
+"""
+
+from datetime import timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+import re
+
+from changes import conference_key
+from utils import merge_layers, normalize_date
+
+# Keys shared by more records than this are too common to say anything
+MAX_BLOCK = 64
+
+# Two sources may disagree on a meeting's dates by this much, and on its
+# submission deadline (extensions) by this much
+DATE_SLACK = timedelta(days=1)
+DEADLINE_SLACK = timedelta(days=60)
+# Submissions close at most this long before the meeting
+SUBMISSION_WINDOW = timedelta(days=400)
+
+# Fields describing one edition of a conference, which absorbed records never fill
+MEETING_FIELDS = ('name', 'conference_dates', 'location', 'venue',
+                  'submission_deadline', 'notification_date')
+
+# Words that appear in most conference names
+GENERIC_WORDS = frozenset({
+    'a', 'an', 'and', 'annual', 'conference', 'for', 'in', 'meeting', 'of', 'on', 'the',
+})
+
+_YEAR_RE = re.compile(r'\b(?:19|20)\d\d\b')
+_ORDINAL_RE = re.compile(r'\b\d+(?:st|nd|rd|th)\b')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+class Profile(NamedTuple):
+    """What the matcher compares, normalized once per record."""
+    short: str
+    short_tokens: frozenset
+    acronyms: frozenset
+    words: Tuple[str, ...]
+    grams: frozenset
+    site: str
+    year: Optional[int]
+    start: Optional[object]
+    end: Optional[object]
+    deadline: Optional[object]
+
+
+def name_words(name: str) -> Tuple[str, ...]:
+    """Lowercase words of a conference name without years, ordinals or generic words."""
+    text = _ORDINAL_RE.sub(' ', _YEAR_RE.sub(' ', name.lower()))
+    return tuple(word for word in _WORD_RE.findall(text) if word not in GENERIC_WORDS)
+
+
+def trigrams(words: Sequence[str]) -> frozenset:
+    text = f" {' '.join(words)} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def site_key(url: Optional[str]) -> str:
+    """Host and first path segment of a URL, without scheme, www. or case."""
+    if not url:
+        return ''
+    parts = urlsplit(url if '//' in url else f"//{url}")
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    segment = parts.path.strip('/').split('/', 1)[0].lower()
+    return f"{host}/{segment}" if segment else host
+
+
+def profile(conf: Dict) -> Profile:
+    short_tokens = tuple(_WORD_RE.findall(str(conf.get('short_name') or '').lower()))
+    words = name_words(str(conf.get('name') or ''))
+    acronyms = set()
+    if short_tokens:
+        acronyms.add(''.join(short_tokens))
+    if len(words) > 1:
+        acronyms.add(''.join(word[0] for word in words))
+    dates = conf.get('conference_dates') or {}
+    start = normalize_date(dates.get('start'))
+    year = conf.get('year')
+    return Profile(
+        short=''.join(short_tokens),
+        short_tokens=frozenset(short_tokens),
+        acronyms=frozenset(acronyms),
+        words=words,
+        grams=trigrams(words),
+        site=site_key(conf.get('website')),
+        year=int(year) if str(year or '').isdigit() else None,
+        start=start,
+        end=normalize_date(dates.get('end')) or start,
+        deadline=normalize_date(conf.get('submission_deadline')),
+    )
+
+
+def block_keys(p: Profile) -> List[str]:
+    keys = [f"a:{acronym}" for acronym in p.acronyms]
+    keys += [f"t:{token}" for token in p.short_tokens]
+    keys += [f"w:{word}" for word in p.words]
+    if p.site:
+        keys.append(f"s:{p.site}")
+    return keys
+
+
+def dates_compatible(a: Profile, b: Profile) -> bool:
+    """
+    Whether two records can describe the same meeting.
+
+    The most specific evidence both records have decides: overlapping
+    meeting dates, then submission deadlines within DEADLINE_SLACK, then one
+    record's deadline falling in the SUBMISSION_WINDOW before the other's
+    meeting, and only then equal years. So editions of a series in different
+    years never match, but one meeting reported under two years does when
+    its dates say so.
+    """
+    if a.start and b.start:
+        return a.start <= b.end + DATE_SLACK and b.start <= a.end + DATE_SLACK
+    if a.deadline and b.deadline:
+        return abs(a.deadline - b.deadline) <= DEADLINE_SLACK
+    if a.start and b.deadline:
+        return timedelta(0) <= a.start - b.deadline <= SUBMISSION_WINDOW
+    if b.start and a.deadline:
+        return timedelta(0) <= b.start - a.deadline <= SUBMISSION_WINDOW
+    return a.year is not None and a.year == b.year
+
+
+def similarity(a: Profile, b: Profile) -> float:
+    """Jaccard similarity of the names' character trigrams."""
+    if not a.grams or not b.grams:
+        return 0.0
+    shared = len(a.grams & b.grams)
+    return shared / (len(a.grams) + len(b.grams) - shared)
+
+
+def names_match(a: Profile, b: Profile) -> bool:
+    """
+    Whether two records name the same conference series.
+
+    Equal short names always do. Related ones (one's tokens contained in the
+    other's, or one the acronym of the other's name) need similar names or
+    the same website. Conflicting short names such as NBER-SI-CF and
+    NBER-SI-RFI need near-identical names.
+    """
+    if a.short and a.short == b.short:
+        return True
+    sim = similarity(a, b)
+    if not a.short or not b.short:
+        return sim >= 0.6 or (sim >= 0.4 and bool(a.site) and a.site == b.site)
+    related = (a.short_tokens <= b.short_tokens or b.short_tokens <= a.short_tokens
+               or a.short in b.acronyms or b.short in a.acronyms)
+    if related:
+        return sim >= 0.4 or (bool(a.site) and a.site == b.site)
+    return sim >= 0.95
+
+
+def is_duplicate(a: Profile, b: Profile) -> bool:
+    return dates_compatible(a, b) and names_match(a, b)
+
+
+def candidate_pairs(profiles: Sequence[Profile]) -> Iterable[Tuple[int, int]]:
+    """Index pairs sharing at least one informative block key, each once."""
+    blocks: Dict[str, List[int]] = {}
+    for i, p in enumerate(profiles):
+        for key in block_keys(p):
+            blocks.setdefault(key, []).append(i)
+    seen = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK:
+            continue
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                if (i, j) not in seen:
+                    seen.add((i, j))
+                    yield i, j
+
+
+def find_duplicates(conferences: Sequence[Dict]) -> List[List[int]]:
+    """Groups of two or more positions in ``conferences`` that are one meeting."""
+    profiles = [profile(conf) for conf in conferences]
+    parent = list(range(len(conferences)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidate_pairs(profiles):
+        if is_duplicate(profiles[i], profiles[j]):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(conferences)):
+        groups.setdefault(find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _year_matches_dates(conf: Dict) -> bool:
+    start = normalize_date((conf.get('conference_dates') or {}).get('start'))
+    return start is not None and str(start.year) == str(conf.get('year'))
+
+
+def _gaps_filled(kept: Dict, other: Dict) -> Dict:
+    """Fields of ``other`` outside MEETING_FIELDS that are None or missing in ``kept``."""
+    fills = {}
+    for field, value in other.items():
+        if field in MEETING_FIELDS or value is None:
+            continue
+        current = kept.get(field)
+        if type(value) is dict and type(current) is dict:
+            sub = {k: v for k, v in value.items() if v is not None and current.get(k) is None}
+            if sub:
+                fills[field] = sub
+        elif current is None:
+            fills[field] = value
+    return fills
+
+
+def dedupe_layers(layers: Sequence[Tuple[str, List[Dict]]]) -> Tuple[List[Tuple[str, List[Dict]]], Dict]:
+    """
+    Fold duplicate records across ``layers`` into the record each group keeps.
+
+    ``layers`` is what merge_layers takes. Records are first merged on their
+    exact keys, then grouped with find_duplicates. Returns (layers, merged):
+    the layers without the other records of each group (as copies; the
+    inputs are not modified) and {kept key: [other keys]} for each group.
+
+    The other records only fill fields that are None in the kept record,
+    never their MEETING_FIELDS. Their fills go in a 'duplicates' layer right
+    after the layer where the kept key first appears, so merge_layers still
+    starts from the kept record and keeps its position.
+    """
+    conferences, _ = merge_layers(layers)
+    rank = {}
+    for level, (_, confs) in enumerate(layers):
+        for conf in confs:
+            rank[conference_key(conf)] = level
+
+    absorbed = set()
+    merged: Dict[tuple, List[tuple]] = {}
+    fills: Dict[tuple, Dict] = {}
+    for group in find_duplicates(conferences):
+        best = max(group, key=lambda i: (rank[conference_key(conferences[i])],
+                                         _year_matches_dates(conferences[i]), -i))
+        kept = conference_key(conferences[best])
+        merged[kept] = [conference_key(conferences[i]) for i in group if i != best]
+        absorbed.update(merged[kept])
+        # Earlier records win, as they would have as merge bases
+        record = dict(conferences[best])
+        for i in sorted(group):
+            if i != best:
+                for field, value in _gaps_filled(record, conferences[i]).items():
+                    current = record.get(field)
+                    record[field] = {**current, **value} if type(current) is dict else value
+        fill = _gaps_filled(conferences[best], record)
+        if fill:
+            fills[kept] = dict(fill, short_name=kept[0], year=kept[1])
+
+    if not absorbed:
+        return list(layers), merged
+    rekeyed = []
+    for name, confs in layers:
+        out = []
+        late_fills = []
+        for conf in confs:
+            key = conference_key(conf)
+            if key in absorbed:
+                continue
+            if key in fills:
+                late_fills.append(fills.pop(key))
+            out.append(conf)
+        rekeyed.append((name, out))
+        if late_fills:
+            rekeyed.append(('duplicates', late_fills))
+    return rekeyed, merged
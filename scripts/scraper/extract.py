@@ -0,0 +1,105 @@
+"""
+Declarative regex extraction for conference pages
+
+Each source builds one Extractor at import time from compiled patterns for the
+year mention and the fields it wants (date range, location, deadline, ...).
+The patterns are fused into a single alternation, so a page is scanned once
+and every candidate is collected with its offset. Each field is then resolved
+per year by picking the candidate nearest to a mention of that year.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Pattern, Tuple
+import re
+
+YEAR = 'year'
+
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+def _scoped(pattern: Pattern) -> str:
+    """Wrap a compiled pattern so its flags apply only inside the group."""
+    letters = ''.join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    return f'(?{letters}:{pattern.pattern})' if letters else f'(?:{pattern.pattern})'
+
+
+class Extractor:
+    """
+    Single-pass extractor for year-keyed conference fields.
+
+    ``year`` must capture a four-digit year in one of its groups. Every other
+    keyword argument names a field; its value is taken from the first group
+    that participated in the match, or the whole match if it has no groups.
+    Fields listed in ``year_bound`` only accept candidates whose text contains
+    the year being resolved (e.g. a date range must mention that year).
+
+    Patterns are tried in the order given at each position and matches do not
+    overlap, so list the more specific patterns (e.g. a deadline phrase that
+    contains a date) before the generic ones.
+    """
+
+    def __init__(self, year: Pattern, year_bound: Tuple[str, ...] = ('date_range',),
+                 **fields: Pattern):
+        if YEAR in fields:
+            raise ValueError("'year' is reserved for the year pattern")
+        self.fields = list(fields)
+        self.year_bound = set(year_bound)
+
+        kinds = dict(fields, **{YEAR: year})
+        self._pattern = re.compile('|'.join(
+            f'(?P<{kind}>{_scoped(pattern)})' for kind, pattern in kinds.items()
+        ))
+        # Inner groups of each kind follow its named wrapper group directly
+        self._groups = {
+            kind: range(self._pattern.groupindex[kind] + 1,
+                        self._pattern.groupindex[kind] + 1 + pattern.groups)
+            for kind, pattern in kinds.items()
+        }
+
+    def scan(self, text: str) -> List[Tuple[str, int, str]]:
+        """Return every (kind, offset, value) candidate in document order."""
+        candidates = []
+        for match in self._pattern.finditer(text):
+            kind = match.lastgroup
+            value = next((match.group(i) for i in self._groups[kind]
+                          if match.group(i) is not None), match.group(kind))
+            candidates.append((kind, match.start(), value))
+        return candidates
+
+    def extract(self, text: str) -> List[Dict]:
+        """
+        Resolve fields for every distinct year mentioned in ``text``.
+
+        Returns one dict per year in order of first mention, with a ``year``
+        int and each field set to the nearest candidate value or None.
+        """
+        mentions: Dict[int, List[int]] = {}
+        by_kind: Dict[str, List[Tuple[int, str]]] = {kind: [] for kind in self.fields}
+
+        for kind, offset, value in self.scan(text):
+            if kind == YEAR:
+                mentions.setdefault(int(value), []).append(offset)
+            else:
+                by_kind[kind].append((offset, value))
+
+        results = []
+        for year, offsets in mentions.items():
+            record = {YEAR: year}
+            for kind, candidates in by_kind.items():
+                if kind in self.year_bound:
+                    token = str(year)
+                    candidates = [c for c in candidates if token in c[1]]
+                record[kind] = _nearest(candidates, offsets)
+            results.append(record)
+        return results
+
+
+def _nearest(candidates: List[Tuple[int, str]], offsets: List[int]) -> Optional[str]:
+    """Value of the candidate closest to any offset; earliest wins ties."""
+    best, best_distance = None, None
+    for offset, value in candidates:
+        i = bisect_left(offsets, offset)
+        distance = min(abs(offsets[j] - offset) for j in (i - 1, i) if 0 <= j < len(offsets))
+        if best_distance is None or distance < best_distance:
+            best, best_distance = value, distance
+    return best
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Recorded-page fixtures for the conference scrapers
+
+Snapshots of every source page live under fixtures/pages/<host>/<path> and
+the records the sources should extract from them in fixtures/expected.yml.
+``check`` serves the snapshots from a local stand-in server, routes the
+sources to it (see utils.set_replay_server), compares their output with the
+expected records and reports per-source parse throughput and peak memory.
+
+The checked-in snapshots are hand-built stand-ins modelled on the society
+pages, including the markup that produced bad locations in the past.
+Refresh them with ``record`` when the live sites are reachable, review the
+diff, then ``check --update`` to accept the new output.
+
+Usage:
+    python fixtures.py check [--only AFA,WFA] [--repeat N] [--update]
+    python fixtures.py record [--only AFA,WFA]
+    python fixtures.py serve [--port PORT]
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics
+import resilience
+from sources import SourceSpec, get_sources
+from crawl import crawl_source
+from utils import set_cache_dir, set_replay_server
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+PAGES_DIR = FIXTURES_DIR / 'pages'
+EXPECTED_FILE = FIXTURES_DIR / 'expected.yml'
+
+EXPECTED_HEADER = (
+    "# Records each scraper source must extract from fixtures/pages.\n"
+    "# Written by `python fixtures.py check --update`; review before committing.\n"
+)
+
+
+def fixture_path(url: str) -> Path:
+    """Where the snapshot of ``url`` is stored."""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if path.endswith('/'):
+        path += 'index.html'
+    elif not Path(path).suffix:
+        path += '.html'
+    return PAGES_DIR / parts.netloc.lower() / path.lstrip('/')
+
+
+# --- stand-in server ---------------------------------------------------------
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve ``/<host>/<path>`` from the snapshot of ``https://<host>/<path>``."""
+
+    def do_GET(self):
+        host, _, rest = self.path.lstrip('/').partition('/')
+        path = fixture_path(f"https://{host}/{rest}").resolve()
+        if PAGES_DIR.resolve() not in path.parents or not path.is_file():
+            self.send_error(404, f"no fixture for {host}/{rest}")
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"  fixture server: {format % args}")
+
+
+def start_server(port: int = 0) -> ThreadingHTTPServer:
+    """Start the stand-in server on localhost in a daemon thread."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+# --- expected records --------------------------------------------------------
+
+def load_expected() -> Dict[str, List[Dict]]:
+    try:
+        with open(EXPECTED_FILE, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def save_expected(expected: Dict[str, List[Dict]]) -> None:
+    with open(EXPECTED_FILE, 'w', encoding='utf-8') as f:
+        f.write(EXPECTED_HEADER)
+        yaml.dump(expected, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+def compare_records(expected: List[Dict], actual: List[Dict]) -> List[str]:
+    """
+    Field-level differences between expected and actual records.
+
+    Records are matched on year. Sources drop meetings from past years, so
+    expected records for a year before the current one are not required.
+    """
+    this_year = datetime.now().year
+    expected_by_year = {conf['year']: conf for conf in expected if conf['year'] >= this_year}
+    actual_by_year = {conf.get('year'): conf for conf in actual}
+    problems = []
+    for year in sorted(expected_by_year.keys() - actual_by_year.keys()):
+        problems.append(f"{year}: missing")
+    for year in sorted(actual_by_year.keys() - expected_by_year.keys(), key=str):
+        problems.append(f"{year}: unexpected record {actual_by_year[year].get('name')!r}")
+    for year in sorted(expected_by_year.keys() & actual_by_year.keys()):
+        want, got = expected_by_year[year], actual_by_year[year]
+        for field in sorted(want.keys() | got.keys()):
+            if want.get(field) != got.get(field):
+                problems.append(f"{year}: {field} is {got.get(field)!r}, expected {want.get(field)!r}")
+    return problems
+
+
+# --- commands ----------------------------------------------------------------
+
+def run_source(spec: SourceSpec) -> List[Dict]:
+    with metrics.source_context(spec.short_name), metrics.stage('total'):
+        return spec.scrape()
+
+
+def check(args: argparse.Namespace) -> int:
+    specs = get_sources(args.only)
+    expected = load_expected()
+    server = start_server()
+    set_cache_dir(None)
+    set_replay_server(server_url(server))
+    resilience.configure(attempts=1)
+    metrics.report.reset()
+
+    failures = 0
+    actual_records = {}
+    rows = []
+    for spec in specs:
+        # Untimed warm-up so imports and session setup are not measured
+        spec.scrape()
+
+        tracemalloc.start()
+        records = run_source(spec)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        actual_records[spec.short_name] = records
+
+        for _ in range(args.repeat):
+            run_source(spec)
+        report = metrics.report.to_dict()['sources'][spec.short_name]
+        stages, counters = report['stages'], report['counters']
+        parse_seconds = max(stages.get('total', 0.0) - stages.get('network', 0.0), 1e-9)
+
+        if spec.short_name not in expected:
+            status = 'no expected records'
+        else:
+            problems = compare_records(expected[spec.short_name], records)
+            status = 'ok' if not problems else f"{len(problems)} FAILED"
+            for problem in problems:
+                print(f"  {spec.short_name} {problem}")
+            failures += bool(problems)
+        rows.append((spec.short_name, len(records), status, counters.get('requests', 0) / parse_seconds,
+                     counters.get('bytes_downloaded', 0) / parse_seconds / 2**20, peak / 2**20))
+
+    server.shutdown()
+    set_replay_server(None)
+
+    print(f"  {'source':<8} {'records':>7}  {'result':<20} {'pages/s':>9} {'MB/s':>8} {'peak MB':>8}")
+    for name, count, status, pages_per_sec, mb_per_sec, peak_mb in rows:
+        print(f"  {name:<8} {count:>7}  {status:<20} {pages_per_sec:9.1f} {mb_per_sec:8.2f} {peak_mb:8.2f}")
+    print(f"  (throughput over {args.repeat + 1} runs excludes loopback network time; "
+          f"peak MB is Python-heap memory from tracemalloc)")
+
+    if args.update:
+        expected.update(actual_records)
+        save_expected(expected)
+        print(f"Updated {EXPECTED_FILE}")
+        return 0
+    return 1 if failures else 0
+
+
+def record(args: argparse.Namespace) -> int:
+    set_cache_dir(None)
+    for spec in get_sources(args.only):
+        def snapshot(url: str, html: str) -> List[Dict]:
+            path = fixture_path(url)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(html, encoding='utf-8')
+            print(f"  {spec.short_name}: {url} -> {path.relative_to(FIXTURES_DIR)}")
+            return []
+
+        # Same crawl as a real run, so followed sub-pages are recorded too
+        crawl_source(spec, snapshot)
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    server = start_server(args.port)
+    print(f"Serving {PAGES_DIR} at {server_url(server)}/<host>/<path>; Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Record and replay scraper page fixtures')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def only(value: str) -> List[str]:
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    check_cmd = sub.add_parser('check', help='run the sources against the fixtures and compare records')
+    check_cmd.add_argument('--only', type=only, help='comma-separated sources to check')
+    check_cmd.add_argument('--repeat', type=int, default=20,
+                           help='extra runs per source for throughput (default: %(default)s)')
+    check_cmd.add_argument('--update', action='store_true',
+                           help='write the current output to fixtures/expected.yml')
+    check_cmd.set_defaults(func=check)
+
+    record_cmd = sub.add_parser('record', help='snapshot the live source pages into fixtures/pages')
+    record_cmd.add_argument('--only', type=only, help='comma-separated sources to record')
+    record_cmd.set_defaults(func=record)
+
+    serve_cmd = sub.add_parser('serve', help='serve the fixtures for manual testing')
+    serve_cmd.add_argument('--port', type=int, default=8000)
+    serve_cmd.set_defaults(func=serve)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+    args = parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyError as e:
+        logger.error(f"Unknown source(s): {e.args[0]}")
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Run instrumentation for the conference scraper
+
+A single RunReport collects per-stage wall time and counters for the whole
+run, broken down by source. Code running on behalf of a source (inside
+scrape_sources' worker threads) is attributed to it through a context
+variable, so utils.fetch() and the source modules only call ``stage()`` and
+``count()``. The report is written as JSON and optionally as OpenMetrics text.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import json
+import threading
+import time
+
+# Bucket name for work not done on behalf of a particular source
+RUN = 'run'
+
+_current_source: ContextVar[str] = ContextVar('scraper_source', default=RUN)
+
+
+class RunReport:
+    """Thread-safe accumulator of stage timings and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._start = time.perf_counter()
+            self._stages: Dict[str, Dict[str, float]] = {}
+            self._counters: Dict[str, Dict[str, int]] = {}
+
+    def add_time(self, stage: str, seconds: float, source: Optional[str] = None) -> None:
+        source = source or _current_source.get()
+        with self._lock:
+            stages = self._stages.setdefault(source, {})
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1, source: Optional[str] = None) -> None:
+        source = source or _current_source.get()
+        with self._lock:
+            counters = self._counters.setdefault(source, {})
+            counters[name] = counters.get(name, 0) + value
+
+    def totals(self) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Stage times and counters summed over all sources."""
+        stages: Dict[str, float] = {}
+        counters: Dict[str, int] = {}
+        with self._lock:
+            for values in self._stages.values():
+                for stage, seconds in values.items():
+                    stages[stage] = stages.get(stage, 0.0) + seconds
+            for values in self._counters.values():
+                for name, value in values.items():
+                    counters[name] = counters.get(name, 0) + value
+        return stages, counters
+
+    def merge(self, stages: Dict[str, float], counters: Dict[str, int],
+              source: Optional[str] = None) -> None:
+        """Add times and counters recorded elsewhere, e.g. by totals() in another process."""
+        for stage, seconds in stages.items():
+            self.add_time(stage, seconds, source)
+        for name, value in counters.items():
+            self.count(name, value, source)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            sources = sorted(set(self._stages) | set(self._counters))
+            return {
+                'started_at': self.started_at.isoformat(),
+                'duration_seconds': round(time.perf_counter() - self._start, 6),
+                'sources': {
+                    source: {
+                        'stages': {k: round(v, 6) for k, v in sorted(self._stages.get(source, {}).items())},
+                        'counters': dict(sorted(self._counters.get(source, {}).items())),
+                    }
+                    for source in sources
+                },
+            }
+
+    def write_json(self, path: Path) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_openmetrics(self, path: Path) -> None:
+        data = self.to_dict()
+        lines = [
+            '# TYPE scraper_run_duration_seconds gauge',
+            f"scraper_run_duration_seconds {data['duration_seconds']}",
+            '# TYPE scraper_stage_seconds gauge',
+            '# UNIT scraper_stage_seconds seconds',
+        ]
+        for source, values in data['sources'].items():
+            for stage, seconds in values['stages'].items():
+                lines.append(f'scraper_stage_seconds{{source="{source}",stage="{stage}"}} {seconds}')
+        names = sorted({name for values in data['sources'].values() for name in values['counters']})
+        for name in names:
+            lines.append(f'# TYPE scraper_{name} counter')
+            for source, values in data['sources'].items():
+                if name in values['counters']:
+                    lines.append(f'scraper_{name}_total{{source="{source}"}} {values["counters"][name]}')
+        lines.append('# EOF')
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+report = RunReport()
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as ``name`` for the current source."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.add_time(name, time.perf_counter() - start)
+
+
+def count(name: str, value: int = 1, source: Optional[str] = None) -> None:
+    """Add to a counter for the current (or given) source."""
+    report.count(name, value, source)
+
+
+def current_source() -> str:
+    """The source the calling code is attributed to, or RUN."""
+    return _current_source.get()
+
+
+@contextmanager
+def source_context(name: str):
+    """Attribute everything recorded in the block to source ``name``."""
+    token = _current_source.set(name)
+    try:
+        yield
+    finally:
+        _current_source.reset(token)
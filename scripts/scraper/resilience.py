@@ -0,0 +1,234 @@
+"""
+Retry, circuit breaker and run time budget for scraper fetches
+
+utils.fetch() runs every request through this module:
+
+- Transient failures (connection errors, timeouts, 429 and 5xx responses) are
+  retried with exponential backoff and full jitter.
+- Each source has a circuit breaker. A run in which any of the source's
+  fetches failed (after retries) counts as one failure, however many pages
+  failed; a run in which they all succeeded closes the circuit. After
+  ``threshold`` consecutive failed runs the circuit opens and the source is
+  skipped for ``cooldown`` seconds; the run after that is a trial that closes
+  or re-opens it. Breaker state is persisted so a dead site stops costing a
+  timeout on every run. Fetches are attributed to sources through
+  metrics.source_context, and the runtime calls finish_source() when a
+  source is done.
+- A run-wide time budget caps request timeouts and retry waits.
+
+Every decision is logged.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_policy = {
+    'attempts': 3,
+    'base_delay': 1.0,
+    'max_delay': 10.0,
+    'threshold': 3,
+    'cooldown': 12 * 3600.0,
+}
+_circuits: Dict[str, Dict] = {}
+# Source -> reason of its first failed fetch this run, or None if all succeeded
+_outcomes: Dict[str, Optional[str]] = {}
+_lock = threading.Lock()
+_deadline: Optional[float] = None
+
+
+class BudgetExhausted(Exception):
+    """Raised when the run's time budget leaves no room for another attempt."""
+
+
+def configure(attempts: Optional[int] = None, base_delay: Optional[float] = None,
+              max_delay: Optional[float] = None, threshold: Optional[int] = None,
+              cooldown: Optional[float] = None) -> None:
+    """Override retry and breaker settings; None keeps the current value."""
+    for name, value in (('attempts', attempts), ('base_delay', base_delay),
+                        ('max_delay', max_delay), ('threshold', threshold),
+                        ('cooldown', cooldown)):
+        if value is not None:
+            _policy[name] = value
+
+
+def attempts() -> int:
+    return max(1, int(_policy['attempts']))
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+# --- time budget -------------------------------------------------------------
+
+def set_run_budget(seconds: Optional[float]) -> None:
+    """Start the run budget clock, or remove the budget with None."""
+    global _deadline
+    _deadline = time.monotonic() + seconds if seconds is not None else None
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the run budget, or None when there is no budget."""
+    if _deadline is None:
+        return None
+    return _deadline - time.monotonic()
+
+
+def request_timeout(timeout: float) -> float:
+    """Cap a request timeout to the remaining budget."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise BudgetExhausted("run time budget exhausted")
+    return min(timeout, remaining)
+
+
+def backoff(url: str, attempt: int, reason: str) -> None:
+    """
+    Sleep before retry number ``attempt`` (1-based) of ``url``.
+
+    Raises BudgetExhausted instead of sleeping past the run budget.
+    """
+    ceiling = min(_policy['max_delay'], _policy['base_delay'] * 2 ** (attempt - 1))
+    delay = random.uniform(0, ceiling)
+    remaining = remaining_budget()
+    if remaining is not None and delay >= remaining:
+        logger.warning(f"  {url}: {reason}; not retrying, {max(remaining, 0):.1f}s left in run budget")
+        raise BudgetExhausted("run time budget exhausted")
+    logger.warning(f"  {url}: {reason}; retry {attempt}/{attempts() - 1} in {delay:.1f}s")
+    metrics.count('retries')
+    time.sleep(delay)
+
+
+# --- circuit breaker ---------------------------------------------------------
+
+def load_circuit_state(path: Path) -> None:
+    """Load persisted breaker state; a missing or unreadable file means all closed."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f).get('sources', {})
+    except FileNotFoundError:
+        state = {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable circuit state {path}: {e}")
+        state = {}
+    with _lock:
+        _circuits.clear()
+        _circuits.update(state)
+        _outcomes.clear()
+
+
+def save_circuit_state(path: Path) -> None:
+    """Persist breaker state for the next run."""
+    with _lock:
+        data = {'sources': {source: _circuits[source] for source in sorted(_circuits)
+                            if _circuits[source].get('failures')}}
+    fd, tmp = tempfile.mkstemp(dir=Path(path).parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def open_until(source: str) -> Optional[float]:
+    """Epoch time the source's open circuit cools down, or None if it may run."""
+    with _lock:
+        circuit = _circuits.get(source)
+        if not circuit or circuit.get('opened_at') is None:
+            return None
+        reopen_at = circuit['opened_at'] + _policy['cooldown']
+    return reopen_at if time.time() < reopen_at else None
+
+
+def half_open(source: str) -> bool:
+    """Whether the source's circuit has cooled down and its next run is a trial."""
+    with _lock:
+        circuit = _circuits.get(source)
+        opened = circuit is not None and circuit.get('opened_at') is not None
+    return opened and open_until(source) is None
+
+
+def format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+
+
+def circuit_allows(url: str) -> bool:
+    """
+    Whether a fetch of ``url`` for the current source may go ahead.
+
+    False while the source's circuit is open and cooling down. Once the
+    cool-down has passed its fetches are let through as a half-open trial.
+    Fetches not made for a source are always allowed.
+    """
+    source = metrics.current_source()
+    if source == metrics.RUN:
+        return True
+    reopen_at = open_until(source)
+    if reopen_at is not None:
+        logger.warning(f"  Circuit open for {source}; not fetching {url} until {format_time(reopen_at)}")
+        return False
+    return True
+
+
+def record_success(url: str) -> None:
+    source = metrics.current_source()
+    if source == metrics.RUN:
+        return
+    with _lock:
+        _outcomes.setdefault(source, None)
+
+
+def record_failure(url: str, reason: str) -> None:
+    source = metrics.current_source()
+    logger.warning(f"  {url} failed: {reason}")
+    if source == metrics.RUN:
+        return
+    with _lock:
+        if _outcomes.get(source) is None:
+            _outcomes[source] = reason
+
+
+def finish_source(source: str) -> None:
+    """
+    Update ``source``'s circuit from the fetches it made this run.
+
+    Any failed fetch counts as one failed run; a run whose fetches all
+    succeeded closes the circuit; a run without fetches changes nothing.
+    """
+    with _lock:
+        if source not in _outcomes:
+            return
+        reason = _outcomes.pop(source)
+        if reason is None:
+            circuit = _circuits.pop(source, None)
+        else:
+            circuit = _circuits.setdefault(source, {'failures': 0, 'opened_at': None})
+            circuit['failures'] += 1
+            failures = circuit['failures']
+            trial = circuit['opened_at'] is not None
+            if failures >= _policy['threshold']:
+                circuit['opened_at'] = time.time()
+    if reason is None:
+        if circuit and circuit.get('failures'):
+            logger.info(f"  Circuit for {source} reset after a successful run")
+    elif failures >= _policy['threshold']:
+        verb = 'Re-opened' if trial else 'Opened'
+        logger.error(f"  {verb} circuit for {source}: {failures} consecutive failed runs "
+                     f"({reason}); cooling down {_policy['cooldown'] / 3600:.1f}h")
+    else:
+        logger.warning(f"  {source} failed run {failures}/{_policy['threshold']}: {reason}")
@@ -0,0 +1,135 @@
+"""
+Refresh scheduling for the scraper daemon
+
+Every (source, conference) pair gets its own next refresh time from the
+conference's status (see utils.determine_status):
+
+- past conferences are never refreshed again;
+- conferences whose submission deadline is within NEAR_DEADLINE are
+  refreshed every NEAR_DEADLINE_INTERVAL (hourly);
+- everything else is refreshed every SourceSpec.refresh_interval (weekly).
+
+A source is due at the earliest next refresh among its conferences. A
+source with no conference left to watch is still checked every
+refresh_interval so a newly announced meeting is picked up. Due sources are
+kept in a heap, and the schedule is persisted as JSON so a restarted daemon
+carries on where it stopped instead of re-scraping everything.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import heapq
+import json
+import logging
+import os
+import tempfile
+
+from utils import determine_status, normalize_date
+
+logger = logging.getLogger(__name__)
+
+NEAR_DEADLINE = timedelta(days=14)
+NEAR_DEADLINE_INTERVAL = timedelta(hours=1)
+
+
+def conference_refresh(conf: Dict, now: datetime, interval: timedelta) -> Optional[datetime]:
+    """Next refresh time for one conference, or None if it needs no more checks."""
+    status = determine_status(conf)
+    if status == 'past':
+        return None
+    if status == 'submissions_open':
+        deadline = normalize_date(conf.get('submission_deadline'))
+        if deadline and deadline - now.date() <= NEAR_DEADLINE:
+            return now + NEAR_DEADLINE_INTERVAL
+    return now + interval
+
+
+def _format(when: Optional[datetime]) -> Optional[str]:
+    return when.isoformat() if when is not None else None
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class Scheduler:
+    """Priority queue of sources ordered by their next refresh time."""
+
+    def __init__(self):
+        self._state: Dict[str, Dict] = {}
+        self._heap: List[tuple] = []
+
+    def load(self, path: Path) -> None:
+        """Restore a saved schedule; a missing or unreadable file starts empty."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f).get('sources', {})
+        except FileNotFoundError:
+            self._state = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schedule {path}: {e}")
+            self._state = {}
+        self._heap = []
+        for name, entry in self._state.items():
+            due = _parse(entry.get('next_refresh'))
+            if due is not None:
+                heapq.heappush(self._heap, (due, name))
+
+    def save(self, path: Path) -> None:
+        data = {'sources': {name: self._state[name] for name in sorted(self._state)}}
+        fd, tmp = tempfile.mkstemp(dir=Path(path).parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+    def track(self, spec, now: datetime) -> None:
+        """Make sure ``spec`` is scheduled; sources new to the schedule are due now."""
+        if spec.short_name not in self._state:
+            self._set_due(spec.short_name, now, {})
+
+    def plan(self, spec, conferences: List[Dict], now: datetime) -> datetime:
+        """Schedule ``spec`` after a scrape, from its current conferences."""
+        refreshes = {}
+        for conf in conferences:
+            refreshes[str(conf.get('year'))] = conference_refresh(conf, now, spec.refresh_interval)
+        upcoming = [when for when in refreshes.values() if when is not None]
+        due = min(upcoming) if upcoming else now + spec.refresh_interval
+        self._set_due(spec.short_name, due, {year: _format(when) for year, when in refreshes.items()})
+        watching = len(upcoming)
+        logger.info(f"  Next refresh of {spec.short_name} at {due:%Y-%m-%d %H:%M} UTC "
+                    f"({watching} conference(s) watched, {len(refreshes) - watching} past)")
+        return due
+
+    def next_due(self) -> Optional[datetime]:
+        """Earliest scheduled refresh, or None when nothing is scheduled."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[str]:
+        """Remove and return the names of all sources due at ``now``."""
+        due = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, name = heapq.heappop(self._heap)
+            if name not in due:
+                due.append(name)
+            self._drop_stale()
+        return due
+
+    def _set_due(self, name: str, due: datetime, conferences: Dict[str, Optional[str]]) -> None:
+        self._state[name] = {'next_refresh': _format(due), 'conferences': conferences}
+        heapq.heappush(self._heap, (due, name))
+
+    def _drop_stale(self) -> None:
+        # Re-planned sources leave their old entry behind; skip it lazily
+        while self._heap:
+            due, name = self._heap[0]
+            current = self._state.get(name, {}).get('next_refresh')
+            if current is not None and _parse(current) == due:
+                return
+            heapq.heappop(self._heap)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
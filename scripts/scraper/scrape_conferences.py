@@ -3,24 +3,51 @@
 Academic Conference Scraper
 
 Aggregates conference information from multiple sources for Finance and Accounting
-academic conferences. Updates _data/conferences.yml for Jekyll site.
+academic conferences. Updates _data/conferences.yml for Jekyll site, along
+with the precomputed views in _data/conference_index/ (see views), and
+appends what changed to _data/.conference_changes.jsonl (see changes).
 
 Usage:
-    python scrape_conferences.py
+    python scrape_conferences.py [--only AFA,SFS] [--workers N] [--source-timeout S] [--total-timeout S]
+                                 [--runtime async [--host-concurrency N] [--host-rps R] [--parse-workers N]]
+                                 [--retries N] [--breaker-threshold N] [--breaker-cooldown H]
+                                 [--cache-dir DIR | --no-cache] [--incremental] [--diff-only] [--no-dedupe]
+                                 [--provenance FILE] [--report FILE] [--openmetrics FILE]
+                                 [--daemon]
 """
 
+import time
+
+_IMPORT_START = time.perf_counter()
+
 import os
 import sys
+import json
+import tempfile
 import yaml
 import logging
+import argparse
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # Add sources directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils import merge_conferences, determine_status, validate_conference
+import metrics
+import resilience
+from scheduler import Scheduler, utcnow
+from sources import SourceSpec, available_sources, get_sources
+from utils import (
+    merge_layers, determine_status, validate_conference, set_cache_dir,
+    load_page_state, save_page_state,
+)
+from changes import CHANGE_LOG, append_changes, diff_conferences, log_changes
+from dedupe import dedupe_layers
+from views import views_missing, write_views
 
 # Configure logging
 logging.basicConfig(
@@ -29,13 +56,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STARTUP_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+# Use the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+# Records serialized per emitter call when streaming conferences.yml
+WRITE_CHUNK_SIZE = 256
+
 
 def load_manual_conferences(data_dir: Path) -> List[Dict]:
     """Load manually maintained conference data."""
     manual_file = data_dir / 'manual_conferences.yml'
     if manual_file.exists():
         with open(manual_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
             return data.get('conferences', [])
     return []
 
@@ -45,58 +84,410 @@ def load_existing_conferences(data_dir: Path) -> List[Dict]:
     conf_file = data_dir / 'conferences.yml'
     if conf_file.exists():
         with open(conf_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
             return data.get('conferences', [])
     return []
 
 
-def scrape_all_conferences() -> List[Dict]:
+def write_conferences(output_file: Path, metadata: Dict, conferences: List[Dict]) -> None:
     """
-    Run all scrapers and collect conference data.
+    Atomically write conferences.yml.
 
-    Currently imports from individual scraper modules.
-    Each scraper returns a list of conference dictionaries.
+    The document is streamed to a temporary file in the same directory, a
+    chunk of records at a time, then fsynced and renamed over the target, so
+    a crash mid-write never leaves a truncated file for Jekyll. The output is
+    byte-identical to dumping the whole {'metadata', 'conferences'} dict.
     """
-    all_conferences = []
-
-    # Import and run each scraper
-    scrapers = {
-        'AFA': 'sources.afa',
-        'WFA': 'sources.wfa',
-        'EFA': 'sources.efa',
-        'SFS': 'sources.sfs',
-        'AAA': 'sources.aaa',
-    }
+    options = dict(Dumper=YamlDumper, default_flow_style=False,
+                   allow_unicode=True, sort_keys=False)
+    fd, tmp = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            yaml.dump({'metadata': metadata}, f, **options)
+            if conferences:
+                f.write('conferences:\n')
+                for i in range(0, len(conferences), WRITE_CHUNK_SIZE):
+                    yaml.dump(conferences[i:i + WRITE_CHUNK_SIZE], f, **options)
+            else:
+                f.write('conferences: []\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, output_file)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
-    for name, module_name in scrapers.items():
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(output_file.parent, os.O_DIRECTORY)
         try:
-            logger.info(f"Attempting to scrape {name}...")
-            module = __import__(module_name, fromlist=['scrape'])
-            if hasattr(module, 'scrape'):
-                conferences = module.scrape()
-                for conf in conferences:
-                    if validate_conference(conf):
-                        all_conferences.append(conf)
-                        logger.info(f"  Found: {conf.get('name')}")
-                    else:
-                        logger.warning(f"  Invalid conference data: {conf}")
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_SOURCE_TIMEOUT = 60.0
+DEFAULT_TOTAL_TIMEOUT = 180.0
+
+# Politeness limits for the async runtime, per host
+DEFAULT_HOST_CONCURRENCY = 2
+DEFAULT_HOST_RPS = 2.0
+
+# Page hashes for --incremental and per-source circuit breaker state.
+# Dotfiles in _data/ are ignored by Jekyll.
+STATE_FILE = '.scraper_state.json'
+CIRCUIT_FILE = '.scraper_circuits.json'
+SCHEDULE_FILE = '.scraper_schedule.json'
+
+# Longest single sleep in daemon mode, so clock jumps and suspends are noticed
+DAEMON_MAX_SLEEP = 3600.0
+
+
+def run_scraper(spec: SourceSpec) -> List[Dict]:
+    """Import a single scraper module and return its raw conference list."""
+    logger.info(f"Attempting to scrape {spec.short_name}...")
+    return spec.scrape()
+
+
+def skip_open_circuits(sources: List[SourceSpec]) -> List[SourceSpec]:
+    """Drop sources whose circuit is open, logging why."""
+    runnable = []
+    for spec in sources:
+        reopen_at = resilience.open_until(spec.short_name)
+        if reopen_at is not None:
+            logger.warning(f"  Skipping {spec.short_name}: circuit open until {resilience.format_time(reopen_at)}")
+            continue
+        if resilience.half_open(spec.short_name):
+            logger.info(f"  Circuit for {spec.short_name} cooled down; running a trial")
+        runnable.append(spec)
+    return runnable
+
+
+def validate_results(order: List[str], results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """Keep valid conferences per source, in ``order``, counting rejects."""
+    by_source = {}
+    for name in order:
+        valid = []
+        for conf in results.get(name, []):
+            if validate_conference(conf):
+                valid.append(conf)
+                metrics.count('records_found', source=name)
+                logger.info(f"  Found: {conf.get('name')}")
             else:
-                logger.warning(f"  Module {module_name} has no scrape() function")
-        except ImportError as e:
-            logger.warning(f"  Scraper module not found: {module_name} ({e})")
-        except Exception as e:
-            logger.error(f"  Error scraping {name}: {e}")
+                metrics.count('records_rejected', source=name)
+                logger.warning(f"  Invalid conference data: {conf}")
+        by_source[name] = valid
+    return by_source
+
+
+def scrape_sources(
+    sources: Optional[List[SourceSpec]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+    total_timeout: float = DEFAULT_TOTAL_TIMEOUT,
+) -> Dict[str, List[Dict]]:
+    """
+    Run all scrapers concurrently and collect valid conferences per source.
+
+    Each scraper runs in a bounded thread pool of ``max_workers`` threads.
+    A source that has been running for longer than ``source_timeout`` seconds,
+    or that has not finished when ``total_timeout`` seconds have elapsed for
+    the whole run, is abandoned and contributes no conferences. Python threads
+    cannot be interrupted, so an abandoned scraper keeps running in the
+    background until its own network timeout fires; its result is discarded.
+
+    ``sources`` defaults to every registered source. The returned dict is in
+    registry order, regardless of completion order, so the output is
+    deterministic. ``max_workers=1`` runs the sources one after another.
+    """
+    if sources is None:
+        sources = get_sources()
+    order = [spec.short_name for spec in sources]
+
+    results: Dict[str, List[Dict]] = {}
+    started: Dict[str, float] = {}
+    runnable = skip_open_circuits(sources)
+
+    def _run(spec: SourceSpec) -> List[Dict]:
+        started[spec.short_name] = time.monotonic()
+        try:
+            with metrics.source_context(spec.short_name), metrics.stage('total'):
+                return run_scraper(spec)
+        finally:
+            resilience.finish_source(spec.short_name)
 
-    return all_conferences
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                  thread_name_prefix='scraper')
+    futures = {executor.submit(_run, spec): spec.short_name for spec in runnable}
+    deadline = time.monotonic() + total_timeout
+    pending = set(futures)
 
+    try:
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                for future in pending:
+                    future.cancel()
+                    logger.error(f"  Abandoned {futures[future]}: run exceeded "
+                                 f"{total_timeout:.0f}s total timeout")
+                break
+
+            # Wake up at the earliest per-source or global deadline
+            expiries = [started[futures[f]] + source_timeout
+                        for f in pending if futures[f] in started]
+            timeout = min([deadline] + expiries) - now
+            done, pending = wait(pending, timeout=max(timeout, 0),
+                                 return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except ImportError as e:
+                    logger.warning(f"  Scraper module for {name} not found ({e})")
+                except Exception as e:
+                    logger.error(f"  Error scraping {name}: {e}")
+
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started and now - started[name] >= source_timeout:
+                    logger.error(f"  Abandoned {name}: exceeded "
+                                 f"{source_timeout:.0f}s source timeout")
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return validate_results(order, results)
+
+
+def scrape_sources_async(
+    sources: Optional[List[SourceSpec]] = None,
+    host_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+    host_rps: float = DEFAULT_HOST_RPS,
+    parse_workers: Optional[int] = None,
+    source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+    total_timeout: float = DEFAULT_TOTAL_TIMEOUT,
+) -> Dict[str, List[Dict]]:
+    """
+    scrape_sources() on the asyncio runtime (see async_runtime).
+
+    All pages of all sources are fetched concurrently, limited to
+    ``host_concurrency`` requests in flight and ``host_rps`` request starts
+    per second for each host, and parsed in a pool of ``parse_workers``
+    processes (default: up to 4; 0 parses in threads). Returns the same
+    registry-ordered dict of valid conferences.
+    """
+    from async_runtime import AsyncRuntime
 
-def main():
+    if sources is None:
+        sources = get_sources()
+    order = [spec.short_name for spec in sources]
+    runtime = AsyncRuntime(host_concurrency=host_concurrency, host_rps=host_rps,
+                           parse_workers=parse_workers)
+    results = runtime.run(skip_open_circuits(sources), source_timeout, total_timeout)
+    return validate_results(order, results)
+
+
+def scrape_all_conferences(*args, **kwargs) -> List[Dict]:
+    """Run all scrapers and return their conferences as one list in source order."""
+    return [conf for confs in scrape_sources(*args, **kwargs).values() for conf in confs]
+
+
+def write_provenance(path: Path, provenance: Dict) -> None:
+    """Dump which layer supplied each field, keyed as 'SHORT_NAME YEAR'."""
+    data = {f"{short_name} {year}": {'base': base, 'overrides': overrides}
+            for (short_name, year), (base, overrides) in provenance.items()}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    logger.info(f"Wrote field provenance for {len(data)} conferences to {path}")
+
+
+def log_import_times(sources: List[SourceSpec]) -> None:
+    """Report startup cost: script import time and per-source module imports."""
+    loaded = [spec for spec in sources if spec.import_seconds is not None]
+    total = sum(spec.import_seconds for spec in loaded)
+    logger.info(f"Startup imports took {STARTUP_SECONDS * 1000:.1f} ms; "
+                f"{len(loaded)} source module(s) took {total * 1000:.1f} ms")
+    heavy = [name for name in ('requests', 'bs4', 'lxml') if name in sys.modules]
+    logger.info(f"  Heavy dependencies loaded: {', '.join(heavy) or 'none'}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Update _data/conferences.yml')
+    parser.add_argument('--only', type=lambda value: [n.strip() for n in value.split(',') if n.strip()],
+                        default=None, metavar='NAMES',
+                        help='comma-separated source short names to scrape, e.g. AFA,SFS')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='number of sources to scrape in parallel (default: %(default)s)')
+    parser.add_argument('--source-timeout', type=float, default=DEFAULT_SOURCE_TIMEOUT,
+                        help='seconds before a single source is abandoned (default: %(default)s)')
+    parser.add_argument('--total-timeout', type=float, default=DEFAULT_TOTAL_TIMEOUT,
+                        help='seconds before all unfinished sources are abandoned (default: %(default)s)')
+    parser.add_argument('--runtime', choices=('threads', 'async'), default='threads',
+                        help='threads: one thread per source; async: fetch every page '
+                             'concurrently under per-host limits (default: %(default)s)')
+    parser.add_argument('--host-concurrency', type=int, default=DEFAULT_HOST_CONCURRENCY,
+                        help='async runtime: requests in flight per host (default: %(default)s)')
+    parser.add_argument('--host-rps', type=float, default=DEFAULT_HOST_RPS,
+                        help='async runtime: request starts per second per host (default: %(default)s)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='async runtime: parser processes, 0 to parse in threads '
+                             '(default: up to 4)')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='retries per request on transient errors (default: %(default)s)')
+    parser.add_argument('--breaker-threshold', type=int, default=3,
+                        help='consecutive runs with a failed fetch before a source is skipped '
+                             '(default: %(default)s)')
+    parser.add_argument('--breaker-cooldown', type=float, default=12.0,
+                        help='hours a failing source is skipped for (default: %(default)s)')
+    parser.add_argument('--cache-dir', type=Path, default=None,
+                        help='directory for the conditional-GET response cache '
+                             '(default: scripts/scraper/.cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always download and parse every page')
+    parser.add_argument('--provenance', type=Path, default=None, metavar='FILE',
+                        help='write a JSON map of which layer supplied each field')
+    parser.add_argument('--report', type=Path, default=None, metavar='FILE',
+                        help='write a JSON run report with per-stage timings and counters')
+    parser.add_argument('--openmetrics', type=Path, default=None, metavar='FILE',
+                        help='also write the run report as OpenMetrics text')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-extract pages whose content changed and skip '
+                             'writing conferences.yml when no record changed')
+    parser.add_argument('--diff-only', action='store_true',
+                        help='scrape and log what changed without writing conferences.yml '
+                             'or the change log')
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help='only merge records with identical short_name and year, '
+                             'skipping fuzzy duplicate detection')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep running and refresh each source when its conferences '
+                             'are due (implies --incremental)')
+    args = parser.parse_args(argv)
+    if args.daemon and args.diff_only:
+        parser.error('--diff-only cannot be combined with --daemon')
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for conference scraper."""
+    args = parse_args(argv)
+    if args.daemon:
+        return run_daemon(args)
+    metrics.report.reset()
+    try:
+        return update_conferences(args)
+    finally:
+        write_reports(args)
+
+
+def write_reports(args: argparse.Namespace) -> None:
+    """Write the run report files requested on the command line."""
+    if args.report:
+        metrics.report.write_json(args.report)
+        logger.info(f"Wrote run report to {args.report}")
+    if args.openmetrics:
+        metrics.report.write_openmetrics(args.openmetrics)
+        logger.info(f"Wrote OpenMetrics report to {args.openmetrics}")
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    """
+    Refresh sources as they fall due until SIGINT or SIGTERM.
+
+    The scheduler (see scheduler) decides when each source is next scraped
+    and its state is saved to _data/.scraper_schedule.json after every
+    cycle. Daemon mode implies --incremental, so conferences.yml is only
+    rewritten when a record changed. Run reports are rewritten each cycle.
+    """
+    try:
+        sources = get_sources(args.only)
+    except KeyError as e:
+        logger.error(f"Unknown source(s): {e.args[0]}; available: {', '.join(available_sources())}")
+        return 2
+    args.incremental = True
+    data_dir = Path(__file__).parent.parent.parent / '_data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    schedule_file = data_dir / SCHEDULE_FILE
+    by_name = {spec.short_name: spec for spec in sources}
+
+    scheduler = Scheduler()
+    scheduler.load(schedule_file)
+    now = utcnow()
+    for spec in sources:
+        scheduler.track(spec, now)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    logger.info(f"Daemon watching {', '.join(by_name)}; schedule in {schedule_file}")
+
+    while not stop.is_set():
+        due = [by_name[name] for name in scheduler.pop_due(utcnow()) if name in by_name]
+        if due:
+            logger.info(f"Refreshing {', '.join(spec.short_name for spec in due)}")
+            metrics.report.reset()
+            try:
+                update_conferences(args, due)
+            except Exception as e:
+                logger.error(f"Refresh failed: {e}")
+            finally:
+                write_reports(args)
+            # Plan from the merged records, which include manual deadlines
+            conferences = load_existing_conferences(data_dir)
+            now = utcnow()
+            for spec in due:
+                scheduler.plan(spec, [conf for conf in conferences
+                                      if conf.get('short_name') == spec.short_name], now)
+            scheduler.save(schedule_file)
+
+        next_due = scheduler.next_due()
+        if next_due is None:
+            logger.info("Nothing left to schedule")
+            break
+        if next_due > utcnow():
+            logger.info(f"Sleeping until {next_due:%Y-%m-%d %H:%M} UTC")
+        while not stop.is_set():
+            remaining = (next_due - utcnow()).total_seconds()
+            if remaining <= 0:
+                break
+            stop.wait(min(remaining, DAEMON_MAX_SLEEP))
+
+    logger.info("Daemon stopped")
+    return 0
+
+
+def update_conferences(args: argparse.Namespace,
+                       sources: Optional[List[SourceSpec]] = None) -> int:
+    """
+    Scrape, merge and write conferences.yml according to parsed CLI options.
+
+    ``sources`` overrides the --only selection.
+    """
+    if sources is None:
+        try:
+            sources = get_sources(args.only)
+        except KeyError as e:
+            logger.error(f"Unknown source(s): {e.args[0]}; available: {', '.join(available_sources())}")
+            return 2
+    if args.no_cache:
+        set_cache_dir(None)
+    elif args.cache_dir is not None:
+        set_cache_dir(args.cache_dir)
+
     # Determine paths
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent.parent
     data_dir = repo_root / '_data'
     output_file = data_dir / 'conferences.yml'
+    state_file = data_dir / STATE_FILE
+    circuit_file = data_dir / CIRCUIT_FILE
 
     logger.info(f"Repository root: {repo_root}")
     logger.info(f"Data directory: {data_dir}")
@@ -104,24 +495,64 @@ def main():
     # Ensure data directory exists
     data_dir.mkdir(parents=True, exist_ok=True)
 
+    if args.incremental:
+        load_page_state(state_file)
+
+    resilience.configure(attempts=args.retries + 1, threshold=args.breaker_threshold,
+                         cooldown=args.breaker_cooldown * 3600)
+    resilience.load_circuit_state(circuit_file)
+    resilience.set_run_budget(args.total_timeout)
+
     # Load existing conferences (to preserve data that wasn't scraped)
-    existing_conferences = load_existing_conferences(data_dir)
+    with metrics.stage('load_existing'):
+        existing_conferences = load_existing_conferences(data_dir)
     logger.info(f"Loaded {len(existing_conferences)} existing conferences")
 
     # Scrape new conference data
     logger.info("Starting conference scraping...")
-    scraped_conferences = scrape_all_conferences()
-    logger.info(f"Scraped {len(scraped_conferences)} conferences")
+    with metrics.stage('scrape'):
+        if args.runtime == 'async':
+            scraped_by_source = scrape_sources_async(
+                sources,
+                host_concurrency=args.host_concurrency,
+                host_rps=args.host_rps,
+                parse_workers=args.parse_workers,
+                source_timeout=args.source_timeout,
+                total_timeout=args.total_timeout,
+            )
+        else:
+            scraped_by_source = scrape_sources(
+                sources,
+                max_workers=args.workers,
+                source_timeout=args.source_timeout,
+                total_timeout=args.total_timeout,
+            )
+    logger.info(f"Scraped {sum(len(c) for c in scraped_by_source.values())} conferences")
+    log_import_times(sources)
+
+    resilience.save_circuit_state(circuit_file)
+    if args.incremental:
+        save_page_state(state_file)
 
     # Load manual conferences (these always take precedence)
-    manual_conferences = load_manual_conferences(data_dir)
+    with metrics.stage('load_manual'):
+        manual_conferences = load_manual_conferences(data_dir)
     logger.info(f"Loaded {len(manual_conferences)} manual conferences")
 
-    # Merge: existing + scraped + manual (later sources take precedence)
-    # First merge existing with scraped
-    combined = merge_conferences(existing_conferences, scraped_conferences)
-    # Then merge with manual entries
-    all_conferences = merge_conferences(combined, manual_conferences)
+    # Merge: existing, then each scraped source, then manual (later layers take precedence)
+    layers = [('existing', existing_conferences)]
+    layers += [(f"scraped:{name}", confs) for name, confs in scraped_by_source.items()]
+    layers.append(('manual', manual_conferences))
+    if not args.no_dedupe:
+        with metrics.stage('dedupe'):
+            layers, duplicates = dedupe_layers(layers)
+        for (short_name, year), others in duplicates.items():
+            metrics.count('duplicates_merged', len(others))
+            logger.info(f"  Merging {', '.join(f'{s} {y}' for s, y in others)} into {short_name} {year}")
+    with metrics.stage('merge'):
+        all_conferences, provenance = merge_layers(layers)
+    if args.provenance:
+        write_provenance(args.provenance, provenance)
 
     # Update status for all conferences
     for conf in all_conferences:
@@ -134,19 +565,37 @@ def main():
         x.get('submission_deadline') or '9999-12-31'
     ))
 
-    # Prepare output
-    output_data = {
-        'metadata': {
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'scraper_version': '1.0.0',
-            'total_conferences': len(all_conferences),
-        },
-        'conferences': all_conferences
-    }
+    with metrics.stage('diff'):
+        changes = diff_conferences(existing_conferences, all_conferences)
+    for change in changes:
+        metrics.count(f"conferences_{change['op']}")
+    log_changes(changes)
+
+    if args.diff_only:
+        logger.info(f"--diff-only: leaving {output_file} untouched")
+        return 0
+
+    if args.incremental and not changes:
+        logger.info(f"No conference changed; leaving {output_file} untouched")
+        metrics.count('yaml_writes_skipped')
+        if views_missing(data_dir):
+            with metrics.stage('views'):
+                write_views(data_dir, existing_conferences)
+        return 0
 
     # Write output
-    with open(output_file, 'w') as f:
-        yaml.dump(output_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    now = datetime.now(timezone.utc).isoformat()
+    metadata = {
+        'last_updated': now,
+        'scraper_version': '1.0.0',
+        'total_conferences': len(all_conferences),
+    }
+    with metrics.stage('yaml_dump'):
+        write_conferences(output_file, metadata, all_conferences)
+    with metrics.stage('views'):
+        write_views(data_dir, all_conferences)
+    # Logged only once the new conferences.yml, the next diff's baseline, is in place
+    append_changes(data_dir / CHANGE_LOG, changes, now)
 
     logger.info(f"Successfully wrote {len(all_conferences)} conferences to {output_file}")
     return 0
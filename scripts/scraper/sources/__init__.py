@@ -1 +1,164 @@
-# Conference scraper sources
+"""
+Registry of conference scraper sources.
+
+Sources are declared here with metadata only. The scraping module, and with
+it requests / bs4 / lxml, is imported the first time the source is run, so a
+single-source refresh does not pay for the others.
+
+A source module either defines ``parse(url, html)``, in which case the
+framework fetches the spec's seed URLs and the links its CrawlRule follows
+(see crawl), or ``scrape()``, which fetches and parses on its own.
+
+Third-party packages can add sources through the ``conference_scraper.sources``
+entry-point group. The entry point name is the source's short name and must
+resolve to a SourceSpec; it is only loaded when that source is selected, so
+keep the declaring module free of heavy imports.
+"""
+
+from datetime import timedelta
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import threading
+import time
+
+import metrics
+from crawl import CrawlRule, crawl_source
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'conference_scraper.sources'
+
+# Shared extraction code every source's parse() runs through
+PARSER_FILES = tuple(Path(__file__).resolve().parent.parent / name for name in ('extract.py', 'utils.py'))
+
+
+class SourceSpec:
+    """
+    Metadata for one scraper source plus lazy access to its module.
+
+    ``refresh_interval`` is how often daemon mode re-scrapes the source when
+    none of its conferences has a deadline coming up (see scheduler).
+    ``parser_version()`` identifies the code that extracts its records, so
+    records cached by an older parser are not reused.
+    """
+
+    def __init__(self, short_name: str, module: str, field: str,
+                 urls: Tuple[str, ...], refresh_interval: timedelta = timedelta(days=7),
+                 follow: Optional[CrawlRule] = None):
+        self.short_name = short_name
+        self.module = module
+        self.field = field
+        self.urls = tuple(urls)
+        self.follow = follow
+        self.refresh_interval = refresh_interval
+        self.import_seconds: Optional[float] = None
+        self._module = None
+        self._parser_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"SourceSpec({self.short_name!r}, {self.module!r})"
+
+    def load(self):
+        """Import the source module on first use and time the import."""
+        with self._lock:
+            if self._module is None:
+                start = time.perf_counter()
+                self._module = import_module(self.module)
+                self.import_seconds = time.perf_counter() - start
+                metrics.report.add_time('import', self.import_seconds, source=self.short_name)
+                logger.info(f"  Imported {self.module} in {self.import_seconds * 1000:.1f} ms")
+            return self._module
+
+    def parser_version(self) -> str:
+        """Hash of the source module and the shared extraction code."""
+        module = self.load()
+        with self._lock:
+            if self._parser_version is None:
+                digest = hashlib.sha256()
+                for path in (Path(module.__file__), *PARSER_FILES):
+                    digest.update(path.read_bytes())
+                self._parser_version = digest.hexdigest()
+            return self._parser_version
+
+    def scrape(self) -> List[Dict]:
+        """Crawl the source's pages through its parse(), or run its scrape()."""
+        module = self.load()
+        if hasattr(module, 'parse'):
+            return crawl_source(self, module.parse)
+        if not hasattr(module, 'scrape'):
+            logger.warning(f"  Module {self.module} has no parse() or scrape() function")
+            return []
+        return module.scrape()
+
+
+# Built-in sources in merge order
+BUILTIN_SOURCES = [
+    SourceSpec('AFA', 'sources.afa', 'finance', ('https://www.afajof.org/annual-meeting',),
+               follow=CrawlRule(r'/call-for-papers/?$')),
+    SourceSpec('WFA', 'sources.wfa', 'finance', ('https://westernfinance.org',),
+               follow=CrawlRule(r'/call-for-papers/?$')),
+    SourceSpec('EFA', 'sources.efa', 'finance', ('https://www.european-finance.org',)),
+    SourceSpec('SFS', 'sources.sfs', 'finance', ('https://sfs.org/sfs-cavalcade/',)),
+    SourceSpec('AAA', 'sources.aaa', 'accounting', ('https://aaahq.org/Meetings',)),
+]
+
+
+def _plugin_entry_points() -> Dict:
+    """Entry points for third-party sources, keyed by short name (not loaded)."""
+    try:
+        eps = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        logger.warning(f"Could not read {ENTRY_POINT_GROUP} entry points: {e}")
+        return {}
+    builtin = {spec.short_name for spec in BUILTIN_SOURCES}
+    plugins = {}
+    for ep in sorted(eps, key=lambda ep: ep.name):
+        if ep.name in builtin:
+            logger.warning(f"Ignoring plugin source {ep.value}: {ep.name} is built in")
+            continue
+        plugins[ep.name] = ep
+    return plugins
+
+
+def available_sources() -> List[str]:
+    """Short names of all built-in and plugin sources, in merge order."""
+    return [spec.short_name for spec in BUILTIN_SOURCES] + list(_plugin_entry_points())
+
+
+def get_sources(names: Optional[Sequence[str]] = None) -> List[SourceSpec]:
+    """
+    Return SourceSpecs in merge order, optionally restricted to ``names``.
+
+    Built-ins come first, then plugins sorted by name. Only the selected
+    plugins' entry points are loaded. Raises KeyError for unknown names.
+    """
+    plugins = _plugin_entry_points()
+    wanted = None
+    if names is not None:
+        wanted = {name.upper() for name in names}
+        known = {spec.short_name.upper() for spec in BUILTIN_SOURCES}
+        known.update(name.upper() for name in plugins)
+        unknown = sorted(wanted - known)
+        if unknown:
+            raise KeyError(', '.join(unknown))
+
+    specs = [spec for spec in BUILTIN_SOURCES
+             if wanted is None or spec.short_name.upper() in wanted]
+    for name, ep in plugins.items():
+        if wanted is not None and name.upper() not in wanted:
+            continue
+        try:
+            spec = ep.load()
+        except Exception as e:
+            logger.error(f"Could not load plugin source {name} ({ep.value}): {e}")
+            continue
+        if not isinstance(spec, SourceSpec):
+            logger.error(f"Plugin source {name} ({ep.value}) is not a SourceSpec")
+            continue
+        specs.append(spec)
+    return specs
@@ -1,128 +1,115 @@
 """
 WFA (Western Finance Association) Conference Scraper
 https://westernfinance.org/
+
+The crawl starts at the home page and follows its link to the call for
+papers, which states the submission deadline and notification date.
 """
 
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 from typing import List, Dict
-import logging
 
-logger = logging.getLogger(__name__)
+import metrics
+from extract import Extractor
+from utils import page_text, parse_date_range, parse_single_date
 
 BASE_URL = "https://westernfinance.org"
-
-
-def scrape() -> List[Dict]:
-    """Scrape WFA conference information."""
+CFP_URL = f"{BASE_URL}/call-for-papers/"
+CFP_PATH_RE = re.compile(r'/call-for-papers/?$')
+
+# Flatten with the streaming lxml extractor rather than a BeautifulSoup tree
+FAST_TEXT = True
+
+# Pattern: "WFA 2026" or "2026 WFA"
+EXTRACTOR = Extractor(
+    year=re.compile(r'WFA\s+(\d{4})|(\d{4})\s+WFA', re.IGNORECASE),
+    deadline=re.compile(r'deadline.*?(\w+\s+\d+,?\s*\d{4})', re.IGNORECASE),
+    date_range=re.compile(r'(\w+\s+\d+[-–]\d+,?\s*\d{4})'),
+    # "City, ST" on one line, so menu text like "Log in / Info / Code" is not taken
+    location=re.compile(r'\b(?:in|at)[ \t]+([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+)*,[ \t]*[A-Z]{2})\b'),
+)
+
+
+CFP_EXTRACTOR = Extractor(
+    year=re.compile(r'WFA\s+(\d{4})|(\d{4})\s+WFA', re.IGNORECASE),
+    year_bound=(),
+    deadline=re.compile(r'deadline.*?(\w+\s+\d+,?\s*\d{4})', re.IGNORECASE),
+    notification=re.compile(r'notif\w*.*?(\w+\s+\d+,?\s*\d{4})', re.IGNORECASE),
+)
+
+def parse(url: str, html: str) -> List[Dict]:
+    """Extract WFA annual meetings from the home page or CFP page HTML."""
+    if CFP_PATH_RE.search(url):
+        return parse_cfp(url, html)
     conferences = []
 
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; AcademicConferenceScraper/1.0)'
-        }
-        response = requests.get(BASE_URL, timeout=30, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        content = soup.get_text()
-
-        # Look for WFA meeting information
-        # Pattern: "WFA 2026" or "2026 WFA"
-        year_pattern = r'WFA\s+(\d{4})|(\d{4})\s+WFA'
-        year_matches = re.findall(year_pattern, content, re.IGNORECASE)
-
-        for match in year_matches:
-            year = int(match[0] or match[1])
-
-            if year < datetime.now().year:
-                continue
-
-            # Try to extract dates
-            date_pattern = r'(\w+\s+\d+[-–]\d+,?\s*\d{4})'
-            date_matches = re.findall(date_pattern, content)
-
-            start_date, end_date = None, None
-            for date_str in date_matches:
-                if str(year) in date_str:
-                    start_date, end_date = parse_date_range(date_str, year)
-                    if start_date:
-                        break
-
-            # Try to extract location
-            location_pattern = r'(?:in|at)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,?\s*(?:[A-Z]{2})?)'
-            location_match = re.search(location_pattern, content)
-            location = location_match.group(1).strip() if location_match else None
-
-            # Try to find submission deadline
-            deadline_pattern = r'deadline.*?(\w+\s+\d+,?\s*\d{4})'
-            deadline_match = re.search(deadline_pattern, content, re.IGNORECASE)
-            submission_deadline = None
-            if deadline_match:
-                submission_deadline = parse_single_date(deadline_match.group(1), year)
-
-            conferences.append({
-                'name': f"WFA Annual Meeting {year}",
-                'short_name': 'WFA',
-                'field': 'finance',
-                'category': 'major',
-                'year': year,
-                'conference_dates': {
-                    'start': start_date,
-                    'end': end_date,
-                },
-                'location': location,
-                'submission_deadline': submission_deadline,
-                'website': BASE_URL,
-                'source': 'scraped',
-                'notes': 'Paper submission via SSRN',
-            })
-
-    except requests.RequestException as e:
-        logger.error(f"Network error scraping WFA: {e}")
-    except Exception as e:
-        logger.error(f"Error scraping WFA: {e}")
-
-    return conferences
-
-
-def parse_date_range(date_str: str, year: int) -> tuple:
-    """Parse date range."""
-    pattern = r'(\w+)\s+(\d+)[-–](\d+),?\s*(\d{4})?'
-    match = re.match(pattern, date_str)
+    content = page_text(html, fast=FAST_TEXT)
 
-    if match:
-        month = match.group(1)
-        start_day = int(match.group(2))
-        end_day = int(match.group(3))
-        year = int(match.group(4)) if match.group(4) else year
+    # Look for WFA meeting information, one match per year mentioned
+    with metrics.stage('extract'):
+        matches = EXTRACTOR.extract(content)
+    for match in matches:
+        year = match['year']
 
-        try:
-            month_num = datetime.strptime(month[:3], '%b').month
-            start = f"{year}-{month_num:02d}-{start_day:02d}"
-            end = f"{year}-{month_num:02d}-{end_day:02d}"
-            return start, end
-        except ValueError:
-            pass
-
-    return None, None
+        if year < datetime.now().year:
+            continue
 
+        start_date, end_date = None, None
+        if match['date_range']:
+            start_date, end_date = parse_date_range(match['date_range'], year)
+
+        location = match['location'].strip() if match['location'] else None
+
+        submission_deadline = None
+        if match['deadline']:
+            submission_deadline = parse_single_date(match['deadline'], year)
+
+        conferences.append({
+            'name': f"WFA Annual Meeting {year}",
+            'short_name': 'WFA',
+            'field': 'finance',
+            'category': 'major',
+            'year': year,
+            'conference_dates': {
+                'start': start_date,
+                'end': end_date,
+            },
+            'location': location,
+            'submission_deadline': submission_deadline,
+            'website': BASE_URL,
+            'cfp_url': CFP_URL,
+            'source': 'scraped',
+            'notes': 'Paper submission via SSRN',
+        })
 
-def parse_single_date(date_str: str, default_year: int) -> str:
-    """Parse a single date string."""
-    date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
+    return conferences
 
-    formats = ['%B %d, %Y', '%B %d %Y', '%B %d']
 
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str.strip(), fmt)
-            if dt.year == 1900:
-                dt = dt.replace(year=default_year)
-            return dt.strftime('%Y-%m-%d')
-        except ValueError:
+def parse_cfp(url: str, html: str) -> List[Dict]:
+    """Deadline and notification date for each meeting on the call for papers."""
+    conferences = []
+    content = page_text(html, fast=FAST_TEXT)
+    with metrics.stage('extract'):
+        matches = CFP_EXTRACTOR.extract(content)
+    for match in matches:
+        year = match['year']
+        if year < datetime.now().year:
             continue
-
-    return None
+        # Named like the main page's records, so a year only the call for
+        # papers mentions still validates
+        conferences.append({
+            'name': f"WFA Annual Meeting {year}",
+            'short_name': 'WFA',
+            'field': 'finance',
+            'category': 'major',
+            'year': year,
+            'submission_deadline': (parse_single_date(match['deadline'], year)
+                                    if match['deadline'] else None),
+            'notification_date': (parse_single_date(match['notification'], year)
+                                  if match['notification'] else None),
+            'website': BASE_URL,
+            'cfp_url': url,
+            'source': 'scraped',
+        })
+    return conferences
@@ -2,98 +2,454 @@
 Shared utilities for conference scrapers
 """
 
-from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from datetime import datetime, date, timezone
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
+from urllib.parse import urlsplit
+import hashlib
+import json
+import os
 import re
 import logging
+import tempfile
+import threading
+
+import metrics
+import resilience
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (compatible; AcademicConferenceScraper/1.0)'
+DEFAULT_TIMEOUT = 30
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache'
+
+_session = None
+_session_lock = threading.Lock()
+_cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+
+# Replay mode: base URL of a fixture server that stands in for every host
+_replay_base: Optional[str] = None
+
+# Incremental mode: url -> {'hash': ..., 'parser': ..., 'records': [...]}, None when disabled
+_page_state: Optional[Dict[str, Dict]] = None
+_state_lock = threading.Lock()
+
+_INVISIBLE_RE = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->',
+                           re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be downloaded."""
+
+
+class Page:
+    """
+    A fetched page together with its on-disk cache entry.
+
+    ``not_modified`` is True when the server answered a conditional request
+    with 304; ``text`` then holds the body stored from the previous run.
+    ``unchanged`` is additionally True in incremental mode when the page's
+    normalized text hashes to the same value as on the previous run.
+    ``parser`` is the version of the code extracting the page's records,
+    stamped on them by store_records (see fetch).
+    """
+
+    def __init__(self, url: str, text: str, not_modified: bool = False,
+                 unchanged: bool = False, entry: Optional[Dict] = None,
+                 parser: Optional[str] = None):
+        self.url = url
+        self.text = text
+        self.not_modified = not_modified
+        self.unchanged = unchanged or not_modified
+        self.entry = entry if entry is not None else {}
+        self.parser = parser
+
+    def cached_records(self) -> Optional[List[Dict]]:
+        """Return the records extracted last run if the page is unchanged."""
+        if self.unchanged:
+            return self.entry.get('records')
+        return None
+
+    def store_records(self, records: List[Dict]) -> None:
+        """Remember the records extracted from this page for the next run."""
+        self.entry['records'] = records
+        self.entry['parser'] = self.parser
+        if _cache_dir is not None:
+            _write_cache_entry(self.url, self.entry)
+        with _state_lock:
+            if _page_state is not None and self.url in _page_state:
+                _page_state[self.url].update(parser=self.parser, records=records)
+
+
+def set_cache_dir(path: Optional[Path]) -> None:
+    """Set the response cache directory, or disable caching with None."""
+    global _cache_dir
+    _cache_dir = Path(path) if path is not None else None
+
+
+def set_replay_server(base: Optional[str]) -> None:
+    """
+    Send every request to a fixture server instead of the live site.
+
+    ``https://host/path?q`` is requested as ``{base}/host/path?q``. Cache
+    entries, page state and circuits stay keyed on the original URL. None
+    restores live fetching.
+    """
+    global _replay_base
+    _replay_base = base.rstrip('/') if base is not None else None
+
+
+def replay_url(url: str) -> str:
+    """The URL actually requested for ``url`` (see set_replay_server)."""
+    if _replay_base is None:
+        return url
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    return f"{_replay_base}/{parts.netloc.lower()}{path}" + (f"?{parts.query}" if parts.query else '')
+
+
+def page_fingerprint(html: str) -> str:
+    """
+    Hash the visible text of a page.
+
+    Scripts, styles, comments and markup are stripped and whitespace is
+    collapsed, so rotating nonces, analytics snippets or re-indented markup
+    do not count as content changes.
+    """
+    text = _INVISIBLE_RE.sub(' ', html)
+    text = _TAG_RE.sub(' ', text)
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def load_page_state(path: Path) -> None:
+    """Enable incremental mode, seeding page hashes from the state file."""
+    global _page_state
+    state = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f).get('pages', {})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable scraper state {path}: {e}")
+    with _state_lock:
+        _page_state = state
+
+
+def save_page_state(path: Path) -> None:
+    """Persist page hashes, parser versions and records for the next incremental run."""
+    with _state_lock:
+        if _page_state is None:
+            return
+        data = {'pages': {url: _page_state[url] for url in sorted(_page_state)}}
+    fd, tmp = tempfile.mkstemp(dir=Path(path).parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _check_fingerprint(url: str, text: str, parser: Optional[str]) -> Optional[List[Dict]]:
+    """
+    Record the page hash and return last run's records if it is unchanged.
+
+    Returns None when incremental mode is off, the page is new, its hash
+    changed or its records were extracted by another ``parser`` version, in
+    which case the caller must re-extract.
+    """
+    with _state_lock:
+        if _page_state is None:
+            return None
+        fingerprint = page_fingerprint(text)
+        previous = _page_state.get(url)
+        if previous and previous.get('hash') == fingerprint and previous.get('parser') == parser:
+            return previous.get('records')
+        _page_state[url] = {'hash': fingerprint, 'parser': parser, 'records': None}
+        return None
+
+
+def get_session():
+    """Return the process-wide pooled requests session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+
+def _cache_path(url: str) -> Path:
+    return _cache_dir / (hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_cache_entry(url: str) -> Optional[Dict]:
+    if _cache_dir is None:
+        return None
+    path = _cache_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('url') == url else None
+
+
+def _write_cache_entry(url: str, entry: Dict) -> None:
+    path = _cache_path(url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not write cache entry for {url}: {e}")
+
+
+def _get_with_retries(url: str, timeout: float, headers: Dict):
+    """GET ``url`` with backoff on transient failures; raises FetchError."""
+    import requests
+
+    if not resilience.circuit_allows(url):
+        raise FetchError(f"circuit open for {metrics.current_source()}")
+
+    attempts = resilience.attempts()
+    for attempt in range(1, attempts + 1):
+        try:
+            response = get_session().get(replay_url(url), timeout=resilience.request_timeout(timeout),
+                                         headers=headers)
+            if response.status_code in resilience.RETRY_STATUSES:
+                raise requests.HTTPError(f"{response.status_code} for url: {url}", response=response)
+            response.raise_for_status()
+        except resilience.BudgetExhausted as e:
+            resilience.record_failure(url, str(e))
+            raise FetchError(str(e)) from e
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and status not in resilience.RETRY_STATUSES:
+                # A permanent HTTP error says nothing about the host being down
+                raise FetchError(str(e)) from e
+            if attempt == attempts:
+                resilience.record_failure(url, str(e))
+                raise FetchError(str(e)) from e
+            try:
+                resilience.backoff(url, attempt, str(e))
+            except resilience.BudgetExhausted as exhausted:
+                resilience.record_failure(url, str(e))
+                raise FetchError(str(exhausted)) from e
+        else:
+            resilience.record_success(url)
+            return response
+
+
+def fetch(url: str, timeout: float = DEFAULT_TIMEOUT, parser: Optional[str] = None) -> Page:
+    """
+    GET a page through the shared session with conditional revalidation.
+
+    When a cached copy exists its ETag / Last-Modified validators are sent as
+    If-None-Match / If-Modified-Since. A 304 reply returns the cached body with
+    ``not_modified`` set; any other success replaces the cache entry. In
+    incremental mode (see load_page_state) a 200 whose normalized text is
+    unchanged is reported as ``unchanged`` with last run's records attached.
+    Records are only reused if they were extracted by the same ``parser``
+    version (e.g. SourceSpec.parser_version()), so a fixed parser re-extracts
+    pages that did not change.
+
+    Transient failures are retried and tracked by the current source's circuit
+    breaker (see resilience). Raises FetchError on network or HTTP errors, when the
+    circuit is open, or when the run time budget is exhausted.
+    """
+    entry = _read_cache_entry(url)
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    with metrics.stage('network'):
+        try:
+            response = _get_with_retries(url, timeout, headers)
+        except FetchError:
+            metrics.count('fetch_errors')
+            raise
+        body = response.text
+    metrics.count('requests')
+    metrics.count('bytes_downloaded', len(response.content))
+    if response.status_code == 304 and entry:
+        logger.info(f"  {url} not modified since last run")
+        metrics.count('cache_hits')
+        if entry.get('parser') != parser:
+            entry['records'] = None
+        state_records = _check_fingerprint(url, entry.get('text', ''), parser)
+        if entry.get('records') is None:
+            entry['records'] = state_records
+        return Page(url, entry.get('text', ''), not_modified=True, entry=entry, parser=parser)
+
+    entry = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': datetime.now(timezone.utc).isoformat(),
+        'text': body,
+    }
+    records = _check_fingerprint(url, body, parser)
+    if records is not None:
+        logger.info(f"  {url} content unchanged since last run")
+        metrics.count('cache_hits')
+        entry['records'] = records
+        entry['parser'] = parser
+    if _cache_dir is not None:
+        _write_cache_entry(url, entry)
+    return Page(url, body, unchanged=records is not None, entry=entry, parser=parser)
+
+
+# Date parsing. Scraped pages repeat the same handful of date strings and
+# determine_status() re-parses every conference on every run, so all string
+# parsing goes through bounded LRU caches. Common shapes are recognised with
+# compiled regexes; strptime is only the fallback for anything else.
+DATE_CACHE_SIZE = 4096
+
+_MONTH_NAMES = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+                'august', 'september', 'october', 'november', 'december')
+_MONTHS = {name: number for number, name in enumerate(_MONTH_NAMES, 1)}
+_MONTHS.update({name[:3]: number for number, name in enumerate(_MONTH_NAMES, 1)})
+
+_ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+_ISO_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})$')
+_US_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})$')
+_MONTH_DAY_RE = re.compile(r'([A-Za-z]+)\s+(\d{1,2})(?:,?\s+(\d{4})|,?)$')
+_RANGE_RE = re.compile(r'(\w+)\s+(\d+)\s*[-–]\s*(\d+),?\s*(\d{4})?')
+_CROSS_MONTH_RANGE_RE = re.compile(r'(\w+)\s+(\d+)\s*[-–]\s*([A-Za-z]+)\s+(\d+),?\s*(\d{4})?')
+
+_NORMALIZE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y')
+_SINGLE_DATE_FORMATS = (
+    ('%B %d, %Y', True),
+    ('%B %d %Y', True),
+    ('%b %d, %Y', True),
+    ('%b %d %Y', True),
+    ('%B %d', False),
+    ('%b %d', False),
+)
+
+
+def _make_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _month_day(text: str) -> Optional[tuple]:
+    """Fast path for 'March 5, 2026', 'Mar 5 2026' and 'March 5'."""
+    match = _MONTH_DAY_RE.match(text)
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
+    year = int(match.group(3)) if match.group(3) else None
+    return year, month, int(match.group(2))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_string(text: str) -> Optional[date]:
+    date_str = _ORDINAL_RE.sub(r'\1', text).strip()
+
+    match = _ISO_RE.match(date_str)
+    if match:
+        return _make_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    match = _US_RE.match(date_str)
+    if match:
+        return _make_date(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+    parts = _month_day(date_str)
+    if parts and parts[0] is not None:
+        return _make_date(*parts)
+
+    for fmt in _NORMALIZE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
 
 def normalize_date(date_input: Any) -> Optional[date]:
     """Convert various date formats to date object."""
     if date_input is None:
         return None
 
-    if isinstance(date_input, date):
-        return date_input
-
     if isinstance(date_input, datetime):
         return date_input.date()
 
+    if isinstance(date_input, date):
+        return date_input
+
     if isinstance(date_input, str):
-        # Clean ordinal suffixes
-        date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_input)
-
-        formats = [
-            '%Y-%m-%d',
-            '%m/%d/%Y',
-            '%B %d, %Y',
-            '%b %d, %Y',
-            '%B %d %Y',
-            '%b %d %Y',
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str.strip(), fmt).date()
-            except ValueError:
-                continue
+        return _parse_date_string(date_input)
 
     return None
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def parse_date_range(date_str: str, default_year: int) -> tuple:
     """
-    Parse date range like 'January 3-5, 2026' or 'June 21-24, 2026'.
+    Parse date range like 'January 3-5, 2026' or 'January 30 - February 2, 2026'.
     Returns (start_date, end_date) as ISO format strings.
     """
-    patterns = [
-        # "January 3-5, 2026"
-        r'(\w+)\s+(\d+)\s*[-–]\s*(\d+),?\s*(\d{4})?',
-        # "January 3 - January 5, 2026"
-        r'(\w+)\s+(\d+)\s*[-–]\s*(\w+)\s+(\d+),?\s*(\d{4})?',
-    ]
-
-    for pattern in patterns:
-        match = re.match(pattern, date_str.strip())
-        if match:
-            groups = match.groups()
-
-            if len(groups) == 4:
-                # Same month format
-                month = groups[0]
-                start_day = int(groups[1])
-                end_day = int(groups[2])
-                year = int(groups[3]) if groups[3] else default_year
-
-                try:
-                    month_num = datetime.strptime(month[:3], '%b').month
-                    start = f"{year}-{month_num:02d}-{start_day:02d}"
-                    end = f"{year}-{month_num:02d}-{end_day:02d}"
-                    return start, end
-                except ValueError:
-                    continue
+    text = date_str.strip()
+
+    match = _RANGE_RE.match(text)
+    if match:
+        # Same month format
+        month = _MONTHS.get(match.group(1)[:3].lower())
+        year = int(match.group(4)) if match.group(4) else default_year
+        if month:
+            start = _make_date(year, month, int(match.group(2)))
+            end = _make_date(year, month, int(match.group(3)))
+            if start and end:
+                return start.isoformat(), end.isoformat()
+
+    match = _CROSS_MONTH_RANGE_RE.match(text)
+    if match:
+        start_month = _MONTHS.get(match.group(1)[:3].lower())
+        end_month = _MONTHS.get(match.group(3)[:3].lower())
+        year = int(match.group(5)) if match.group(5) else default_year
+        if start_month and end_month:
+            start = _make_date(year, start_month, int(match.group(2)))
+            end = _make_date(year, end_month, int(match.group(4)))
+            if start and end:
+                return start.isoformat(), end.isoformat()
 
     return None, None
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def parse_single_date(date_str: str, default_year: int) -> Optional[str]:
     """Parse a single date string and return ISO format."""
     # Clean ordinal suffixes
-    date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
-
-    formats = [
-        ('%B %d, %Y', True),
-        ('%B %d %Y', True),
-        ('%b %d, %Y', True),
-        ('%b %d %Y', True),
-        ('%B %d', False),
-        ('%b %d', False),
-    ]
-
-    for fmt, has_year in formats:
+    date_str = _ORDINAL_RE.sub(r'\1', date_str).strip()
+
+    parts = _month_day(date_str)
+    if parts:
+        year, month, day = parts
+        parsed = _make_date(year if year is not None else default_year, month, day)
+        if parsed:
+            return parsed.isoformat()
+
+    for fmt, has_year in _SINGLE_DATE_FORMATS:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
+            dt = datetime.strptime(date_str, fmt)
             if not has_year:
                 dt = dt.replace(year=default_year)
             return dt.strftime('%Y-%m-%d')
@@ -103,40 +459,93 @@ def parse_single_date(date_str: str, default_year: int) -> Optional[str]:
     return None
 
 
+def parse_dates(date_strs: Iterable[str], default_year: int) -> List[Optional[str]]:
+    """
+    Batch form of parse_single_date for a list of candidate strings.
+
+    Duplicates are parsed once; the result list lines up with the input.
+    """
+    parsed: Dict[str, Optional[str]] = {}
+    results = []
+    for date_str in date_strs:
+        if date_str not in parsed:
+            parsed[date_str] = parse_single_date(date_str, default_year)
+        results.append(parsed[date_str])
+    return results
+
+
+def normalize_dates(values: Iterable[Any]) -> List[Optional[date]]:
+    """Batch form of normalize_date."""
+    return [normalize_date(value) for value in values]
+
+
 def validate_conference(conf: Dict) -> bool:
     """Validate conference data has required fields."""
     required = ['name', 'short_name', 'year']
     return all(conf.get(field) for field in required)
 
 
-def merge_conferences(scraped: List[Dict], manual: List[Dict]) -> List[Dict]:
+def merge_layers(layers: Sequence[Tuple[str, Iterable[Dict]]]) -> Tuple[List[Dict], Dict]:
     """
-    Merge scraped and manual conference data.
-    Manual entries take precedence for matching conferences.
+    Merge any number of ordered conference layers in a single pass.
+
+    ``layers`` is a sequence of (layer_name, conferences), lowest precedence
+    first. Records are matched on (short_name, year). The first layer to
+    mention a conference contributes all its fields; later layers override
+    only the fields they set to a non-None value. Nested dicts such as
+    ``conference_dates`` are merged key by key, so a scraper that found no
+    dates does not wipe dates from an earlier layer.
+
+    Input dicts are never mutated: each record is copied once, and nested
+    dicts are replaced rather than updated in place.
+
+    Returns (conferences, provenance). Conferences keep the order in which
+    they were first seen. Provenance maps each key to (base_layer, overrides)
+    where ``overrides`` is {field: layer_name} for fields a later layer won,
+    using 'parent.child' names for nested fields; every other field came from
+    ``base_layer``.
     """
-    # Create lookup by (short_name, year)
-    merged = {}
+    merged: Dict[tuple, Dict] = {}
+    provenance: Dict[tuple, Tuple[str, Dict[str, str]]] = {}
 
-    # Add scraped conferences
-    for conf in scraped:
-        key = (conf.get('short_name'), conf.get('year'))
-        merged[key] = conf.copy()
+    for layer, conferences in layers:
+        for conf in conferences:
+            key = (conf.get('short_name'), conf.get('year'))
+            record = merged.get(key)
 
-    # Override with manual conferences
-    for conf in manual:
-        key = (conf.get('short_name'), conf.get('year'))
-        if key in merged:
-            # Merge: manual values override scraped
-            merged[key].update({k: v for k, v in conf.items() if v is not None})
-        else:
-            merged[key] = conf.copy()
+            if record is None:
+                merged[key] = dict(conf)
+                provenance[key] = (layer, {})
+                continue
 
-    return list(merged.values())
+            overrides = provenance[key][1]
+            for field, value in conf.items():
+                if value is None:
+                    continue
+                if type(value) is dict:
+                    current = record.get(field)
+                    if type(current) is dict:
+                        updates = {k: v for k, v in value.items() if v is not None}
+                        record[field] = {**current, **updates}
+                        for sub_field in updates:
+                            overrides[f"{field}.{sub_field}"] = layer
+                        continue
+                record[field] = value
+                overrides[field] = layer
+
+    return list(merged.values()), provenance
+
+
+def merge_conferences(scraped: List[Dict], manual: List[Dict]) -> List[Dict]:
+    """
+    Merge scraped and manual conference data.
+    Manual entries take precedence for matching conferences.
+    """
+    return merge_layers([('scraped', scraped), ('manual', manual)])[0]
 
 
 def determine_status(conf: Dict) -> str:
     """Determine conference status based on dates."""
-    from datetime import timezone
     today = datetime.now(timezone.utc).date()
 
     # Check if conference is past
@@ -157,6 +566,84 @@ def determine_status(conf: Dict) -> str:
     return 'upcoming'
 
 
+# Elements whose text is never rendered, and elements that start a new line
+_INVISIBLE_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'head', 'title'})
+_BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'details', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table',
+    'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+})
+HTML_TEXT_CHUNK_SIZE = 64 * 1024
+
+
+class _TextCollector:
+    """lxml parser target that keeps visible text and marks block boundaries."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.hidden = 0
+
+    def start(self, tag, attrib):
+        if tag in _INVISIBLE_TAGS:
+            self.hidden += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def end(self, tag):
+        if tag in _INVISIBLE_TAGS:
+            self.hidden = max(0, self.hidden - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def data(self, data):
+        if not self.hidden:
+            self.parts.append(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self) -> str:
+        return ''.join(self.parts)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Visible text of an HTML page without building a document tree.
+
+    The markup is fed in chunks to lxml's HTMLParser with a target object, so
+    only text nodes are kept. Script, style and other invisible elements are
+    dropped and block-level elements are separated by newlines.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=_TextCollector())
+    for i in range(0, len(html), HTML_TEXT_CHUNK_SIZE):
+        parser.feed(html[i:i + HTML_TEXT_CHUNK_SIZE])
+    if not html:
+        parser.feed(' ')
+    return parser.close()
+
+
+def page_text(html: str, fast: bool = False) -> str:
+    """
+    Flatten a page to text for regex extraction.
+
+    ``fast=True`` uses html_to_text(); otherwise the page is parsed into a
+    BeautifulSoup tree and flattened with get_text(). Sources opt in through
+    their FAST_TEXT flag.
+    """
+    if fast:
+        with metrics.stage('html_text'):
+            return html_to_text(html)
+
+    from bs4 import BeautifulSoup
+    with metrics.stage('parse_html'):
+        soup = BeautifulSoup(html, 'lxml')
+    with metrics.stage('get_text'):
+        return soup.get_text()
+
+
 def clean_text(text: str) -> str:
     """Clean and normalize text from HTML."""
     # Remove extra whitespace
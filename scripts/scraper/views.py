@@ -0,0 +1,126 @@
+"""
+Precomputed views of conferences.yml for the Jekyll conferences page
+
+The page used to sort every conference by deadline in Liquid and loop over
+the whole list once per section, and its filter script inspected every card
+on each change. The scraper now writes the orderings the page needs next to
+conferences.yml, in _data/conference_index/:
+
+- sections.yml: positions in conferences.yml of the cards in each page
+  section, sorted by submission deadline (TBD deadlines last);
+- by_status.yml, by_field.yml, by_category.yml: the same, per value;
+- feed.json: for the client-side filter, the card positions on the page
+  that match each field, status and category value.
+
+Positions index ``site.data.conferences.conferences``, so the views are only
+valid for the conferences.yml they were written with; write_views() is
+called whenever that file is written. Files whose content is unchanged are
+not rewritten.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+import json
+import logging
+import os
+import tempfile
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+VIEW_DIR = 'conference_index'
+
+# Page sections in display order and the statuses each one lists
+SECTIONS = {
+    'open': ('submissions_open',),
+    'upcoming': ('submissions_closed', 'upcoming'),
+}
+STATUSES = ('submissions_open', 'submissions_closed', 'upcoming', 'past')
+
+# Values the page's conference-card.html falls back to
+DEFAULT_CATEGORY = 'major'
+
+VIEW_HEADER = "# Generated by scripts/scraper/views.py from conferences.yml; do not edit.\n"
+
+
+def deadline_order(conferences: List[Dict]) -> List[int]:
+    """Positions of ``conferences`` by submission deadline, TBD last, then by name."""
+    def key(i: int):
+        conf = conferences[i]
+        return (conf.get('submission_deadline') or '9999-12-31', conf.get('short_name') or '', i)
+    return sorted(range(len(conferences)), key=key)
+
+
+def build_views(conferences: List[Dict]) -> Dict[str, Dict]:
+    """All views of ``conferences``, keyed by file name without extension."""
+    order = deadline_order(conferences)
+    by_status: Dict[str, List[int]] = {status: [] for status in STATUSES}
+    by_field: Dict[str, List[int]] = {}
+    by_category: Dict[str, List[int]] = {}
+    for i in order:
+        conf = conferences[i]
+        by_status.setdefault(conf.get('status') or 'upcoming', []).append(i)
+        by_field.setdefault(conf.get('field') or 'other', []).append(i)
+        by_category.setdefault(conf.get('category') or DEFAULT_CATEGORY, []).append(i)
+
+    sections = {name: [i for i in order if conferences[i].get('status') in statuses]
+                for name, statuses in SECTIONS.items()}
+
+    # Cards appear on the page section by section
+    cards = [i for name in SECTIONS for i in sections[name]]
+    position = {i: p for p, i in enumerate(cards)}
+
+    def card_positions(view: Dict[str, List[int]]) -> Dict[str, List[int]]:
+        return {value: sorted(position[i] for i in indices if i in position)
+                for value, indices in view.items()}
+
+    feed = {
+        'count': len(cards),
+        'field': card_positions(by_field),
+        'status': card_positions(by_status),
+        'category': card_positions(by_category),
+    }
+    return {
+        'sections': sections,
+        'by_status': by_status,
+        'by_field': by_field,
+        'by_category': by_category,
+        'feed': feed,
+    }
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except FileNotFoundError:
+        pass
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return True
+
+
+def write_views(data_dir: Path, conferences: List[Dict]) -> int:
+    """Write the views of ``conferences`` under ``data_dir``; returns files written."""
+    view_dir = data_dir / VIEW_DIR
+    view_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for name, view in build_views(conferences).items():
+        if name == 'feed':
+            text = json.dumps(view, separators=(',', ':'), sort_keys=True) + '\n'
+            path = view_dir / 'feed.json'
+        else:
+            # Flow style keeps each list of positions on one line
+            text = VIEW_HEADER + yaml.safe_dump(view, default_flow_style=None, sort_keys=False, width=100)
+            path = view_dir / f'{name}.yml'
+        written += _write_if_changed(path, text)
+    logger.info(f"Wrote {written} conference view file(s) to {view_dir}")
+    return written
+
+
+def views_missing(data_dir: Path) -> bool:
+    return not (data_dir / VIEW_DIR / 'sections.yml').exists()
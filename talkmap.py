@@ -4,44 +4,313 @@
 #
 # (c) 2016-2017 R. Stuart Geiger, released under the MIT license
 #
-# Run this from the _talks/ directory, which contains .md files of all your talks. 
-# This scrapes the location YAML field from each .md file, geolocates it with
+# Run this from the _talks/ directory, which contains .md files of all your talks.
+# This reads the location YAML field from each .md file, geolocates it with
 # geopy/Nominatim, and uses the getorg library to output data, HTML,
 # and Javascript for a standalone cluster map.
 #
-# Requires: glob, getorg, geopy
+# Only the front matter of each talk is read (up to its closing `---`), and
+# of that only the `location:` key: a plain or simply quoted one-line value is
+# taken as is, anything else is parsed as YAML. Large folders are read on a
+# process pool. Talks without a location are left off the map.
+#
+# Geocoding results are cached in ../talkmap/geocache.json, keyed by the
+# normalized location string (case and whitespace folded), so re-running over
+# unchanged talks makes no network calls. Each distinct location is looked up
+# once per run, and lookups are throttled by a token bucket to Nominatim's
+# limit of one request per second. Locations Nominatim does not know are
+# cached too; failed requests are not, so they are retried next run.
+#
+# The resolver is pluggable: `--nominatim-domain localhost:8080 --scheme http`
+# points geopy at a stand-in server, and geocode_locations() accepts any
+# callable that maps a location string to a Point or None.
+#
+# The map's data, org-locations.js, is rewritten as a whole, but only when
+# its content changes, and getorg's HTML and Javascript are only written when
+# map.html is missing. The geocode cache is saved every CACHE_SAVE_EVERY lookups, so an
+# interrupted run keeps what it resolved.
+#
+# Requires: glob, getorg, geopy, pyyaml
 
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import codecs
 import glob
-import getorg
-from geopy import Nominatim
+import json
+import os
+import re
+import tempfile
+import time
+
+import yaml
+
+# Use the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+MAP_FOLDER = "../talkmap"
+CACHE_FILE = MAP_FOLDER + "/geocache.json"
+CACHE_SAVE_EVERY = 20
+READ_WORKERS = min(8, os.cpu_count() or 1)
+PARALLEL_MIN_TALKS = 2000
+READ_CHUNK = 2048
+USER_AGENT = "academicpages-talkmap"
+NOMINATIM_RATE = 1.0  # requests per second allowed by the Nominatim usage policy
+
+# A one-line location YAML reads as the text itself: a double-quoted string
+# without escapes, a single-quoted one without '' or a plain word that
+# cannot be a comment, mapping, null, boolean, number or date. Anything else
+# goes through the YAML loader.
+_SIMPLE_SCALAR_RE = re.compile(r"""
+    "([^"\\]*)"$                                  # double-quoted, no escapes
+  | '([^']*)'$                                    # single-quoted, no ''
+  | (?!(?:~|null|true|false|yes|no|on|off|y|n)$)  # plain: not null or boolean,
+    ([^\s\-?:,\[\]{}#&*!|>'"%@`+.\d]              # no indicator, sign or digit first,
+     (?:(?!:\s|\s\#).)*?)(?<!:)$                  # no ': ' or ' #', no trailing ':'
+""", re.IGNORECASE | re.VERBOSE)
+
+_CLOSE_RE = re.compile(rb"^(?:---|\.\.\.)[ \t\r]*$", re.MULTILINE)
+# The location key's line and its indented or blank continuation lines
+_LOCATION_RE = re.compile(rb"^location:[^\n]*(?:\n(?:[ \t][^\n]*|\r?)$)*", re.MULTILINE)
+
+# What getorg needs from a geocoding result
+Point = namedtuple("Point", "latitude longitude")
+
+
+def location_lines(path):
+    """Lines of the top-level `location:` key in a Markdown file's front matter.
+
+    Reads READ_CHUNK bytes at a time until the closing `---`, so the body of a
+    talk is rarely loaded, and decodes only the location's lines. Returns
+    them with any indented continuation lines, or None if the file has no
+    front matter or no location.
+    """
+    # Unbuffered: one read usually covers the whole front matter
+    with open(path, "rb", buffering=0) as f:
+        head = f.read(READ_CHUNK)
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8):]
+        first, _, rest = head.partition(b"\n")
+        if first.rstrip() != b"---":
+            return None
+        close = _CLOSE_RE.search(rest)
+        while close is None:
+            more = f.read(READ_CHUNK)
+            if not more:
+                print(f"Skipping {path}: front matter is never closed")
+                return None
+            rest += more
+            close = _CLOSE_RE.search(rest)
+    matches = _LOCATION_RE.findall(rest, 0, close.start())
+    if not matches:
+        return None
+    # A repeated key overrides, as in YAML
+    return matches[-1].decode("utf-8").splitlines(keepends=True)
+
+
+def parse_location(path, lines):
+    """The location value on lines, parsed as YAML unless it is a simple scalar."""
+    value = lines[0][len("location:"):].strip()
+    if len(lines) == 1 or not "".join(lines[1:]).strip():
+        match = _SIMPLE_SCALAR_RE.match(value)
+        if match:
+            return next(group for group in match.groups() if group is not None)
+    try:
+        data = yaml.load("".join(lines), Loader=YamlLoader)
+    except yaml.YAMLError as e:
+        print(f"Skipping {path}: unreadable location ({e})")
+        return None
+    return data.get("location") if isinstance(data, dict) else None
+
+
+def talk_location(path):
+    """The talk's location field, or None if it has none."""
+    lines = location_lines(path)
+    if lines is None:
+        return None
+    location = parse_location(path, lines)
+    if location is None:
+        return None
+    location = str(location).strip()
+    return location or None
+
+
+def read_locations(paths, workers=READ_WORKERS):
+    """Locations of the talks in paths, in order, skipping talks without one.
+
+    Small sets are read in this process; larger ones are split over `workers`
+    processes, since the scan is CPU-bound once the files are cached.
+    """
+    if workers <= 1 or len(paths) < PARALLEL_MIN_TALKS:
+        locations = map(talk_location, paths)
+    else:
+        chunksize = -(-len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            locations = list(pool.map(talk_location, paths, chunksize=chunksize))
+    return [location for location in locations if location is not None]
+
+
+def normalize_location(location):
+    """Cache key for a location string."""
+    return " ".join(location.split()).casefold()
+
+
+class TokenBucket:
+    """Allow `rate` calls per second on average, in bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class GeoCache:
+    """Persistent {normalized location: Point or None} map, stored as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.points = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f).get("locations", {})
+        except FileNotFoundError:
+            stored = {}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable geocode cache {path}: {e}")
+            stored = {}
+        for key, point in stored.items():
+            self.points[key] = Point(*point) if point is not None else None
+
+    def __contains__(self, location):
+        return normalize_location(location) in self.points
+
+    def get(self, location):
+        return self.points[normalize_location(location)]
+
+    def put(self, location, point):
+        self.points[normalize_location(location)] = point
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"locations": {key: list(point) if point is not None else None
+                                     for key, point in sorted(self.points.items())}},
+                      f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def nominatim_resolver(domain=None, scheme=None, timeout=10):
+    """Resolver backed by geopy's Nominatim client."""
+    from geopy import Nominatim
+
+    options = {"user_agent": USER_AGENT, "timeout": timeout}
+    if domain:
+        options["domain"] = domain
+    if scheme:
+        options["scheme"] = scheme
+    geocoder = Nominatim(**options)
+
+    def resolve(location):
+        result = geocoder.geocode(location)
+        return Point(result.latitude, result.longitude) if result is not None else None
+    return resolve
+
 
-g = glob.glob("*.md")
+def geocode_locations(locations, cache, resolve, bucket):
+    """Geocode each distinct location once, from the cache where possible.
 
+    Returns ({location: Point or None}, number of resolver calls). Locations
+    whose lookup raised are left out and not cached.
+    """
+    points = {}
+    calls = 0
+    for location in dict.fromkeys(locations):
+        if location not in cache:
+            bucket.acquire()
+            calls += 1
+            try:
+                cache.put(location, resolve(location))
+            except Exception as e:
+                print(f"Could not geocode {location!r}: {e}")
+                continue
+            if calls % CACHE_SAVE_EVERY == 0:
+                cache.save()
+        points[location] = cache.get(location)
+    return points, calls
 
-geocoder = Nominatim()
-location_dict = {}
-location = ""
-permalink = ""
-title = ""
 
+def write_map_data(location_dict, folder=MAP_FOLDER):
+    """Write org-locations.js as getorg does, only if it changed; returns True if written."""
+    # getorg labels its [name, latitude, longitude] rows [lat, lon, user]
+    points = [[location, point.latitude, point.longitude]
+              for location, point in location_dict.items() if point is not None]
+    data = "var addressPoints = " + json.dumps(points, indent=2) + ";"
+    path = os.path.join(folder, "org-locations.js")
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+    return True
 
-for file in g:
-    with open(file, 'r') as f:
-        lines = f.read()
-        if lines.find('location: "') > 1:
-            loc_start = lines.find('location: "') + 11
-            lines_trim = lines[loc_start:]
-            loc_end = lines_trim.find('"')
-            location = lines_trim[:loc_end]
-                            
-           
-        location_dict[location] = geocoder.geocode(location)
-        print(location, "\n", location_dict[location])
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the talk location cluster map")
+    parser.add_argument("--cache", default=CACHE_FILE, help="geocode cache file (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=NOMINATIM_RATE,
+                        help="geocoding requests per second (default: %(default)s)")
+    parser.add_argument("--nominatim-domain", help="Nominatim server to query instead of the public one")
+    parser.add_argument("--scheme", choices=["http", "https"], help="scheme for --nominatim-domain")
+    parser.add_argument("--workers", type=int, default=READ_WORKERS,
+                        help="processes reading talk files (default: %(default)s)")
+    args = parser.parse_args(argv)
 
-m = getorg.orgmap.create_map_obj()
-getorg.orgmap.output_html_cluster_map(location_dict, folder_name="../talkmap", hashed_usernames=False)
+    g = glob.glob("*.md")
+    locations = read_locations(g, args.workers)
 
+    cache = GeoCache(args.cache)
+    resolve = nominatim_resolver(args.nominatim_domain, args.scheme)
+    location_dict, calls = geocode_locations(locations, cache, resolve, TokenBucket(args.rate))
+    cache.save()
+    for location, point in location_dict.items():
+        print(location, "\n", point)
+    print(f"{len(location_dict)} locations from {len(locations)} of {len(g)} talks, {calls} geocoding requests")
 
+    if not os.path.exists(os.path.join(MAP_FOLDER, "map.html")):
+        import getorg
+        getorg.orgmap.output_html_cluster_map(location_dict, folder_name=MAP_FOLDER, hashed_usernames=False)
+        print(f"Wrote the cluster map to {MAP_FOLDER}")
+    elif write_map_data(location_dict):
+        print(f"Updated {MAP_FOLDER}/org-locations.js")
+    else:
+        print(f"{MAP_FOLDER}/org-locations.js is up to date")
 
 
+if __name__ == '__main__':
+    main()